@@ -123,6 +123,16 @@ class ArticleAdmin(admin.ModelAdmin):
         }
         js = ('/static/article_admin.js',)
 
+    def get_queryset(self, request):
+        """Keep the changelist from loading article bodies it never displays."""
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name == 'research_article_changelist':
+            queryset = queryset.defer(
+                'content', 'gpt_summary', 'acknowledgement', 'table_of_contents'
+            ).prefetch_related('authors__user', 'categories')
+        return queryset
+
     def display_authors(self, obj):
         """Return a comma-separated list of authors for the article."""
         return ", ".join(author.user.username for author in obj.authors.all())
@@ -6,7 +6,7 @@ from apps.research.models import Category
 class CategoryAdmin(admin.ModelAdmin):
     """Admin interface for the Category model."""
     
-    list_display = ('name', 'slug', 'is_primary', 'created_at')
+    list_display = ('name', 'slug', 'is_primary', 'article_count', 'created_at')
     list_per_page = 25
     search_fields = ('name',)
     list_filter = ('created_at', 'is_primary')
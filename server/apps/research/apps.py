@@ -17,4 +17,6 @@ class ResearchConfig(AppConfig):
             algoliasearch.register(Author, AuthorIndex)
             algoliasearch.register(Category, CategoryIndex)
         except RegistrationError:
-            pass
\ No newline at end of file
+            pass
+
+        from . import signals  # noqa: F401
\ No newline at end of file
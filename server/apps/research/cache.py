@@ -0,0 +1,178 @@
+import logging
+import time
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CACHE_GENERATION_KEY = 'research:cache_generation'
+CACHE_INVALIDATED_AT_KEY = 'research:cache_invalidated_at'
+ARTICLE_DETAIL_KEY = 'research:article_detail:{generation}:{identifier}'
+ARTICLE_LOOKUP_KEY = 'research:article_lookup:{identifier}'
+RSS_FEED_KEY = 'research:rss_feed:{generation}:{host}'
+
+
+def get_cache_generation():
+    """Return the current generation of the research response caches."""
+    generation = cache.get(CACHE_GENERATION_KEY)
+    if generation is None:
+        # Seed from the clock so that a generation evicted from the cache
+        # never comes back with a value that older entries were stored under.
+        cache.add(CACHE_GENERATION_KEY, int(time.time() * 1000), timeout=None)
+        # Nothing cached under the new generation predates it
+        cache.add(CACHE_INVALIDATED_AT_KEY, timezone.now(), timeout=None)
+        generation = cache.get(CACHE_GENERATION_KEY)
+    return generation
+
+
+def get_cache_state():
+    """Return the current cache generation and when it was last invalidated, if known."""
+    try:
+        generation = get_cache_generation()
+        return generation, cache.get(CACHE_INVALIDATED_AT_KEY)
+    except Exception as e:
+        logger.error(f"Error reading research cache state: {str(e)}", exc_info=True)
+        return None, None
+
+
+def invalidate_research_cache():
+    """Invalidate every cached research response by moving to a new generation."""
+    try:
+        cache.set(CACHE_INVALIDATED_AT_KEY, timezone.now(), timeout=None)
+        cache.incr(CACHE_GENERATION_KEY)
+    except ValueError:
+        get_cache_generation()
+    except Exception as e:
+        logger.error(f"Error invalidating research cache: {str(e)}", exc_info=True)
+
+
+def _normalize_identifier(identifier):
+    """Return UUIDs in their canonical form so every spelling shares one entry."""
+    try:
+        return str(uuid.UUID(str(identifier)))
+    except ValueError:
+        return identifier
+
+
+def article_detail_key(identifier, generation=None):
+    if generation is None:
+        generation = get_cache_generation()
+    return ARTICLE_DETAIL_KEY.format(generation=generation, identifier=_normalize_identifier(identifier))
+
+
+def get_cached_article_detail(article_id):
+    """Return the cached detail payload for an article id, if any."""
+    try:
+        return cache.get(article_detail_key(article_id))
+    except Exception as e:
+        logger.error(f"Error reading article detail cache: {str(e)}", exc_info=True)
+        return None
+
+
+def set_cached_article_detail(data):
+    """Cache a detail payload under the article's id."""
+    try:
+        timeout = getattr(settings, 'ARTICLE_DETAIL_CACHE_TIMEOUT', 60 * 15)
+        cache.set(article_detail_key(data['id']), data, timeout=timeout)
+    except Exception as e:
+        logger.error(f"Error writing article detail cache: {str(e)}", exc_info=True)
+
+
+def rss_feed_key(host, generation=None):
+    if generation is None:
+        generation = get_cache_generation()
+    return RSS_FEED_KEY.format(generation=generation, host=host)
+
+
+def get_cached_rss_feed(host):
+    """Return the rendered feed and its validators cached for a host, if any."""
+    try:
+        return cache.get(rss_feed_key(host))
+    except Exception as e:
+        logger.error(f"Error reading RSS feed cache: {str(e)}", exc_info=True)
+        return None
+
+
+def set_cached_rss_feed(host, feed):
+    """Cache a rendered feed for a host until the research cache generation moves."""
+    try:
+        timeout = getattr(settings, 'RSS_FEED_CACHE_TIMEOUT', 60 * 60 * 24)
+        cache.set(rss_feed_key(host), feed, timeout=timeout)
+    except Exception as e:
+        logger.error(f"Error writing RSS feed cache: {str(e)}", exc_info=True)
+
+
+def article_lookup_key(identifier):
+    return ARTICLE_LOOKUP_KEY.format(identifier=_normalize_identifier(identifier))
+
+
+def resolve_article_identifier(identifier):
+    """
+    Resolve a UUID, current slug or historical slug to the article it names.
+
+    Returns a dict with the article ``id`` and its canonical ``slug``, or None
+    when nothing matches. Misses are cached as well so that crawlers requesting
+    stale URLs do not reach the database on every hit.
+    """
+    from .models import Article
+
+    key = article_lookup_key(identifier)
+    try:
+        entry = cache.get(key)
+    except Exception as e:
+        logger.error(f"Error reading article lookup cache: {str(e)}", exc_info=True)
+        entry = None
+    if entry is not None:
+        return entry if entry['id'] else None
+
+    if _is_uuid(identifier):
+        articles = Article.objects.filter(pk=_normalize_identifier(identifier))
+    else:
+        # Current slugs win over historical ones that were later reused
+        articles = Article.objects.filter(
+            Q(slug=identifier) | Q(slug_history__old_slug=identifier)
+        ).annotate(
+            is_current=Case(When(slug=identifier, then=Value(1)), default=Value(0), output_field=IntegerField())
+        ).order_by('-is_current')
+    match = articles.values('id', 'slug').first()
+
+    try:
+        if match:
+            entry = {'id': str(match['id']), 'slug': match['slug']}
+            cache.set(key, entry, timeout=None)
+        else:
+            cache.set(key, {'id': None, 'slug': None},
+                      timeout=getattr(settings, 'ARTICLE_LOOKUP_MISS_TIMEOUT', 60 * 10))
+    except Exception as e:
+        logger.error(f"Error writing article lookup cache: {str(e)}", exc_info=True)
+    return entry if match else None
+
+
+def index_article_identifiers(article_id, slug, old_slugs=()):
+    """Point the article's UUID, current slug and historical slugs at its canonical slug."""
+    entry = {'id': str(article_id), 'slug': slug}
+    identifiers = [article_id, slug, *old_slugs]
+    try:
+        cache.set_many({article_lookup_key(identifier): entry for identifier in identifiers if identifier},
+                       timeout=None)
+    except Exception as e:
+        logger.error(f"Error updating article lookup cache: {str(e)}", exc_info=True)
+
+
+def forget_article_identifiers(*identifiers):
+    """Drop lookup entries, e.g. for a deleted article."""
+    try:
+        cache.delete_many([article_lookup_key(identifier) for identifier in identifiers if identifier])
+    except Exception as e:
+        logger.error(f"Error clearing article lookup cache: {str(e)}", exc_info=True)
+
+
+def _is_uuid(value):
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
@@ -0,0 +1,57 @@
+import hashlib
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from .cache import get_cache_state
+
+
+def make_validators(request, *parts, last_modified=None):
+    """
+    Build an ETag and Last-Modified pair for a response without rendering it.
+
+    The ETag covers the request path and query string, the given parts and the
+    research cache generation, which moves whenever an article, author or
+    category changes. Last-Modified is the later of ``last_modified`` and the
+    last cache invalidation, so edits to related objects are never masked.
+    """
+    generation, invalidated_at = get_cache_state()
+    return _validators(request, generation, invalidated_at, parts, last_modified)
+
+
+def collection_validators(request, *parts):
+    """
+    Build validators for a collection without querying it. Every change that
+    can alter a collection moves the cache generation on, and the request's
+    path and query string tell its pages apart. Returns ``(None, None)`` when
+    the generation cannot be read, as nothing else tells versions apart.
+    """
+    generation, invalidated_at = get_cache_state()
+    if generation is None:
+        return None, None
+    return _validators(request, generation, invalidated_at, parts, None)
+
+
+def _validators(request, generation, invalidated_at, parts, last_modified):
+    key = '|'.join([str(generation), request.get_full_path(), *(str(part) for part in parts)])
+    etag = hashlib.md5(key.encode('utf-8')).hexdigest()
+    timestamps = [timestamp for timestamp in (last_modified, invalidated_at) if timestamp]
+    return etag, max(timestamps) if timestamps else None
+
+
+def not_modified_response(request, etag, last_modified):
+    """Return a 304 response if the request's validators still match, else None."""
+    if etag is None:
+        return None
+    return get_conditional_response(
+        request,
+        etag=quote_etag(etag),
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def apply_validators(response, etag, last_modified):
+    """Attach the validators to a successful response."""
+    if response.status_code == 200 and etag is not None:
+        response['ETag'] = quote_etag(etag)
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import logging
+from algoliasearch_django import algolia_engine
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from .models import IndexedRecord
+
+logger = logging.getLogger(__name__)
+
+# How long a queued index update keeps later changes to the same object from queueing another
+PENDING_UPDATE_TIMEOUT = 60 * 10
+
+# Record attributes that change on every save without changing what is searchable
+UNHASHED_ATTRIBUTES = ('updated_at',)
+
+
+def record_hash(record):
+    """Hash an Algolia record independently of its key order and volatile attributes."""
+    hashed = {key: value for key, value in record.items() if key not in UNHASHED_ATTRIBUTES}
+    payload = json.dumps(hashed, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def store_record_hashes(index_name, records):
+    """Remember the records just pushed to ``index_name``."""
+    IndexedRecord.objects.bulk_create(
+        [
+            IndexedRecord(index_name=index_name, object_id=record['objectID'], record_hash=record_hash(record))
+            for record in records
+        ],
+        update_conflicts=True,
+        unique_fields=['index_name', 'object_id'],
+        update_fields=['record_hash', 'pushed_at'],
+    )
+
+
+def _pending_key(model_label, object_id):
+    return f'research:index_pending:{model_label}:{object_id}'
+
+
+def queue_index_update(model, object_id):
+    """
+    Sync an object's Algolia record from a Celery task once the current
+    transaction commits. Updates already queued for the object absorb this one.
+    """
+    if not settings.ALGOLIA_RECORD_SYNC or not algolia_engine.is_registered(model):
+        return
+    model_label = model._meta.label
+    object_id = str(object_id)
+
+    def enqueue():
+        from .tasks import sync_index_record
+        key = _pending_key(model_label, object_id)
+        if cache.add(key, True, PENDING_UPDATE_TIMEOUT):
+            try:
+                sync_index_record.delay(model_label, object_id)
+            except Exception as e:
+                # Nothing was queued, so the next change must not be absorbed
+                cache.delete(key)
+                logger.error(f"Error queueing index update of {model_label} {object_id}: {str(e)}", exc_info=True)
+
+    transaction.on_commit(enqueue)
+
+
+def sync_record(model_label, object_id):
+    """
+    Push the current record of an object to its index, or delete it once the
+    object is gone or no longer indexed. Records matching the last pushed hash
+    are skipped. Returns what was done.
+    """
+    # Changes made from here on queue a new update
+    cache.delete(_pending_key(model_label, object_id))
+
+    model = apps.get_model(model_label)
+    adapter = algolia_engine.get_adapter(model)
+    queryset = adapter.get_queryset() if callable(adapter.get_queryset) else model.objects.all()
+    instance = queryset.filter(pk=object_id).first()
+    indexed = IndexedRecord.objects.filter(index_name=adapter.index_name, object_id=object_id).first()
+
+    if instance is None:
+        if indexed is None and model.objects.filter(pk=object_id).exists():
+            # Never pushed and not meant to be
+            return 'skipped'
+        algolia_engine.client.delete_objects(index_name=adapter.index_name, object_ids=[object_id])
+        IndexedRecord.objects.filter(index_name=adapter.index_name, object_id=object_id).delete()
+        logger.info(f"Deleted {object_id} from {adapter.index_name}")
+        return 'deleted'
+
+    record = adapter.get_raw_record(instance)
+    if indexed is not None and indexed.record_hash == record_hash(record):
+        return 'unchanged'
+
+    algolia_engine.client.save_objects(index_name=adapter.index_name, objects=[record])
+    store_record_hashes(adapter.index_name, [record])
+    logger.info(f"Pushed {object_id} to {adapter.index_name}")
+    return 'saved'
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from apps.research.models import Article
+from apps.research.text import html_to_text
+
+class Command(BaseCommand):
+    help = 'Compute the stored plain text, word count and reading time of existing articles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of articles to update per query',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show how many articles would change without saving them',
+        )
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs['batch_size']
+        dry_run = kwargs.get('dry_run', False)
+
+        articles = Article.objects.only('id', 'content', 'content_text', 'word_count', 'min_read').order_by('pk')
+        batch = []
+        updated_count = 0
+
+        for article in articles.iterator(chunk_size=batch_size):
+            previous = (article.content_text, article.word_count, article.min_read)
+            article.content_text = html_to_text(article.content)
+            article.calculate_min_read()
+            if (article.content_text, article.word_count, article.min_read) == previous:
+                continue
+            batch.append(article)
+            updated_count += 1
+            if len(batch) >= batch_size and not dry_run:
+                Article.objects.bulk_update(batch, ['content_text', 'word_count', 'min_read'])
+                batch = []
+
+        if batch and not dry_run:
+            Article.objects.bulk_update(batch, ['content_text', 'word_count', 'min_read'])
+
+        if dry_run:
+            self.stdout.write(f'Would update reading time for {updated_count} articles.')
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f'Successfully updated reading time for {updated_count} articles.')
+            )
@@ -0,0 +1,93 @@
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from apps.research.models import Article, Author, Category
+from apps.research.renderers import ORJSONRenderer
+from apps.research.serializers import ArticleListSerializer, ArticleSerializer, drf_representation
+from apps.research.serializers.article_serializer import load_article_relations, load_related_articles
+
+class Command(BaseCommand):
+    help = 'Compare the fast serializers and orjson renderer with the DRF defaults on a seeded dataset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--articles',
+            type=int,
+            default=200,
+            help='Number of articles to seed',
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=55,
+            help='Number of articles in the benchmarked list page',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Number of times each payload is rendered',
+        )
+
+    def handle(self, *args, **kwargs):
+        # Everything is seeded in a transaction that is rolled back afterwards
+        with transaction.atomic():
+            articles = self.seed(kwargs['articles'])
+            page = articles[:kwargs['page_size']]
+            load_related_articles(articles)
+            load_article_relations(articles)
+
+            self.compare('list page', ArticleListSerializer, page, True, kwargs['iterations'])
+            self.compare('detail', ArticleSerializer, articles[0], False, kwargs['iterations'])
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        users = [User(username=f'benchmark-author-{i}') for i in range(5)]
+        User.objects.bulk_create(users)
+        authors = [Author.objects.create(user=user, full_name=f'Benchmark Author {i}', bio='Writes\u2028about “rollups”')
+                   for i, user in enumerate(users)]
+        categories = [Category.objects.create(name=f'Benchmark Category {i}') for i in range(10)]
+
+        content = ''.join(
+            f'<h2>Section {i}</h2><p>Paragraph with ünïcödé, “quotes” and a \u2029 separator.</p>' * 5
+            for i in range(10)
+        )
+        articles = []
+        for i in range(count):
+            article = Article.objects.create(
+                title=f'Benchmark article {i}',
+                summary=f'Summary of benchmark article {i}',
+                content=content,
+                status='ready',
+            )
+            article.authors.set(authors[i % 5:i % 5 + 2])
+            article.categories.set(categories[i % 10:i % 10 + 3])
+            articles.append(article)
+        for article in articles:
+            article.refresh_recommendations()
+        return list(Article.objects.filter(pk__in=[article.pk for article in articles]).order_by('-created_at'))
+
+    def compare(self, label, serializer_class, instance, many, iterations):
+        def render(renderer):
+            return renderer.render(serializer_class(instance, many=many).data)
+
+        with drf_representation():
+            reference_time, reference = self.time(lambda: render(JSONRenderer()), iterations)
+        fast_time, fast = self.time(lambda: render(ORJSONRenderer()), iterations)
+
+        if fast != reference:
+            raise CommandError(f'The fast {label} payload differs from the DRF payload')
+
+        self.stdout.write(
+            f'{label}: DRF {reference_time * 1000:.2f} ms, fast {fast_time * 1000:.2f} ms, '
+            f'{reference_time / fast_time:.1f}x faster ({len(fast)} bytes)'
+        )
+
+    def time(self, render, iterations):
+        result = render()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            render()
+        return (time.perf_counter() - start) / iterations, result
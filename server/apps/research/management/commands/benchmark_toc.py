@@ -0,0 +1,100 @@
+import time
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+from django.db.models.functions import Length
+from django.utils.text import slugify
+from apps.research.models import Article
+
+def build_toc_with_soup(content):
+    """The previous BeautifulSoup/html.parser builder, kept as the baseline."""
+    soup = BeautifulSoup(content, 'html.parser')
+    toc = []
+    stack = [{'level': 0, 'children': toc}]
+    for header in soup.find_all(['h1', 'h2', 'h3']):
+        level = int(header.name[1])
+        title = header.get_text()
+        header['id'] = slugify(title)
+        while level <= stack[-1]['level']:
+            stack.pop()
+        new_item = {'title': title, 'id': header['id'], 'children': []}
+        stack[-1]['children'].append(new_item)
+        stack.append({'level': level, 'children': new_item['children']})
+    return toc, str(soup)
+
+class Command(BaseCommand):
+    help = 'Time the table of contents builder on the largest articles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Number of largest articles to benchmark',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=5,
+            help='Number of times each article is processed',
+        )
+        parser.add_argument(
+            '--synthetic-sections',
+            type=int,
+            default=300,
+            help='Sections in the generated article used when the database has no articles',
+        )
+
+    def handle(self, *args, **kwargs):
+        iterations = kwargs['iterations']
+        articles = list(
+            Article.objects.exclude(content__isnull=True)
+            .annotate(content_length=Length('content'))
+            .order_by('-content_length')
+            .only('id', 'title', 'content', 'content_hash', 'table_of_contents')[:kwargs['limit']]
+        )
+        if not articles:
+            articles = [self.synthetic_article(kwargs['synthetic_sections'])]
+
+        totals = {'html.parser': 0.0, 'lxml': 0.0, 'unchanged': 0.0}
+        for article in articles:
+            content = article.content
+            soup_time, (soup_toc, _) = self.time(lambda: build_toc_with_soup(content), iterations)
+
+            def build():
+                article.content = content
+                article.build_table_of_contents()
+            lxml_time, _ = self.time(build, iterations)
+
+            # What a save that leaves the content alone now costs
+            article.content_hash = article.hash_content(article.content)
+            unchanged_time, _ = self.time(article._content_changed, iterations)
+
+            totals['html.parser'] += soup_time
+            totals['lxml'] += lxml_time
+            totals['unchanged'] += unchanged_time
+            matches = 'same TOC' if soup_toc == article.table_of_contents else 'TOC DIFFERS'
+            self.stdout.write(
+                f'{article.title[:50]!r} ({len(content)} chars): html.parser {soup_time * 1000:.1f} ms, '
+                f'lxml {lxml_time * 1000:.1f} ms, unchanged {unchanged_time * 1000:.2f} ms, {matches}'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Total: html.parser {totals["html.parser"] * 1000:.1f} ms, lxml {totals["lxml"] * 1000:.1f} ms '
+            f'({totals["html.parser"] / totals["lxml"]:.1f}x), unchanged {totals["unchanged"] * 1000:.2f} ms'
+        ))
+
+    def synthetic_article(self, sections):
+        content = ''.join(
+            f'<h{i % 3 + 1}>Section {i}</h{i % 3 + 1}>'
+            f'<p>Paragraph {i} with <a href="https://example.com/{i}">a link</a>, <strong>emphasis</strong> '
+            f'and &amp; entities.</p><ul><li>Point one</li><li>Point two</li></ul>'
+            for i in range(sections)
+        )
+        return Article(title='Synthetic article', content=content)
+
+    def time(self, run, iterations):
+        result = run()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        return (time.perf_counter() - start) / iterations, result
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+from apps.research.models import Category
+
+class Command(BaseCommand):
+    help = 'Recount the stored ready-article count of every category.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List categories whose stored count has drifted without fixing them',
+        )
+
+    def handle(self, *args, **kwargs):
+        dry_run = kwargs.get('dry_run', False)
+
+        drifted = [
+            category for category in Category.objects.annotate(
+                actual_count=Count('articles', filter=Q(articles__status='ready'), distinct=True)
+            )
+            if category.article_count != category.actual_count
+        ]
+        for category in drifted:
+            self.stdout.write(
+                f'{category.name}: stored {category.article_count}, actual {category.actual_count}'
+            )
+
+        if dry_run:
+            self.stdout.write(f'Would update article counts for {len(drifted)} categories.')
+            return
+
+        Category.refresh_article_counts([category.pk for category in drifted])
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully updated article counts for {len(drifted)} categories.')
+        )
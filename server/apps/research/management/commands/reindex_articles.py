@@ -0,0 +1,95 @@
+import json
+import os
+from algoliasearch_django import algolia_engine
+from django.core.management.base import BaseCommand
+from apps.research.indexing import store_record_hashes
+from apps.research.models import Article
+from apps.research.services.algolia_records import build_article_record
+
+class Command(BaseCommand):
+    help = (
+        'Push every ready article to its Algolia index in batches. Relations are prefetched per chunk, '
+        'and progress is checkpointed so an interrupted run can resume.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of articles loaded, built and uploaded together',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default='.reindex_articles_checkpoint.json',
+            help='File recording the last uploaded article, used to resume',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore an existing checkpoint and start from the first article',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Build the records without uploading them or writing checkpoints',
+        )
+
+    def handle(self, *args, **kwargs):
+        chunk_size = kwargs['chunk_size']
+        dry_run = kwargs['dry_run']
+        adapter = algolia_engine.get_adapter(Article)
+
+        checkpoint = None if kwargs['restart'] else self.read_checkpoint(kwargs['checkpoint'], adapter.index_name)
+        last_id = checkpoint['last_id'] if checkpoint else None
+        indexed = checkpoint['indexed'] if checkpoint else 0
+
+        articles = adapter.get_queryset().order_by('pk')
+        remaining = articles.filter(pk__gt=last_id) if last_id else articles
+        total = indexed + remaining.count()
+        if checkpoint:
+            self.stdout.write(f'Resuming after article {last_id} ({indexed}/{total} already indexed).')
+
+        while True:
+            chunk = list(articles.filter(pk__gt=last_id)[:chunk_size] if last_id else articles[:chunk_size])
+            if not chunk:
+                break
+
+            records = [build_article_record(adapter.get_record_data(article)) for article in chunk]
+
+            last_id = chunk[-1].pk
+            indexed += len(records)
+            if not dry_run:
+                algolia_engine.client.batch(
+                    index_name=adapter.index_name,
+                    batch_write_params={
+                        'requests': [{'action': 'updateObject', 'body': record} for record in records],
+                    },
+                )
+                store_record_hashes(adapter.index_name, records)
+                self.write_checkpoint(kwargs['checkpoint'], adapter.index_name, last_id, indexed)
+            self.stdout.write(f'{indexed}/{total} articles indexed')
+
+        if not dry_run and os.path.exists(kwargs['checkpoint']):
+            os.remove(kwargs['checkpoint'])
+
+        verb = 'Built' if dry_run else 'Indexed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {indexed} article records for {adapter.index_name}.'))
+
+    def read_checkpoint(self, path, index_name):
+        try:
+            with open(path) as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+        if checkpoint.get('index') != index_name:
+            self.stdout.write(self.style.WARNING(f'Ignoring checkpoint for another index: {checkpoint.get("index")}'))
+            return None
+        return checkpoint
+
+    def write_checkpoint(self, path, index_name, last_id, indexed):
+        # Written to a temporary file first so an interruption never leaves a truncated checkpoint
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as checkpoint_file:
+            json.dump({'index': index_name, 'last_id': str(last_id), 'indexed': indexed}, checkpoint_file)
+        os.replace(tmp_path, path)
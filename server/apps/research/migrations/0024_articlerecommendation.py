@@ -0,0 +1,54 @@
+# Generated by Django 5.0.8 on 2026-10-18 14:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+def populate_recommendations(apps, schema_editor):
+    """
+    Data migration to precompute the related articles of every existing article.
+    """
+    Article = apps.get_model('research', 'Article')
+    ArticleRecommendation = apps.get_model('research', 'ArticleRecommendation')
+
+    for article in Article.objects.all():
+        related_ids = list(
+            article.related_articles.filter(status='ready')
+            .order_by('-scheduled_publish_time')
+            .values_list('id', flat=True)[:3]
+        )
+        if not related_ids:
+            related_ids = list(
+                Article.objects.filter(status='ready', categories__in=article.categories.all())
+                .exclude(id=article.id)
+                .distinct()
+                .order_by('-scheduled_publish_time')
+                .values_list('id', flat=True)[:3]
+            )
+        ArticleRecommendation.objects.bulk_create([
+            ArticleRecommendation(article=article, recommended_id=related_id, position=position)
+            for position, related_id in enumerate(related_ids)
+        ])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0023_category_parent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleRecommendation',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('position', models.PositiveSmallIntegerField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='research.article')),
+                ('recommended', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommended_for', to='research.article')),
+            ],
+            options={
+                'db_table': 'research_articlerecommendation',
+                'ordering': ('position',),
+                'unique_together': {('article', 'position')},
+            },
+        ),
+        migrations.RunPython(populate_recommendations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+def drop_stale_sort_value(apps, schema_editor):
+    """
+    Drop the ``sort_value`` column left behind when ``authors`` was switched
+    back from a SortedManyToManyField. It is NOT NULL without a default, so
+    plain many-to-many inserts into the table fail or are silently ignored.
+    """
+    table = 'research_article_authors'
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        columns = [column.name for column in connection.introspection.get_table_description(cursor, table)]
+    if 'sort_value' in columns:
+        schema_editor.execute(
+            f'ALTER TABLE {schema_editor.quote_name(table)} DROP COLUMN {schema_editor.quote_name("sort_value")}'
+        )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0024_articlerecommendation'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_stale_sort_value, migrations.RunPython.noop),
+    ]
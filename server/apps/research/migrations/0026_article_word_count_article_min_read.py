@@ -0,0 +1,23 @@
+# Generated by Django 5.0.8 on 2026-10-18 14:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0025_drop_article_authors_sort_value'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='min_read',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.8 on 2026-10-18 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0026_article_word_count_article_min_read'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', '-scheduled_publish_time', '-id'], name='article_status_publish_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.8 on 2026-10-18 14:53
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+def populate_article_counts(apps, schema_editor):
+    """
+    Data migration to store the ready-article count of every existing category.
+    """
+    Category = apps.get_model('research', 'Category')
+    Article = apps.get_model('research', 'Article')
+
+    ready_counts = Article.categories.through.objects.filter(
+        category_id=OuterRef('pk'), article__status='ready'
+    ).order_by().values('category_id').annotate(total=Count('article_id')).values('total')
+    Category.objects.update(article_count=Coalesce(Subquery(ready_counts), Value(0)))
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0027_article_status_publish_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='article_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(populate_article_counts, migrations.RunPython.noop),
+    ]
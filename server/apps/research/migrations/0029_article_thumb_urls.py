@@ -0,0 +1,61 @@
+# Generated by Django 5.0.8 on 2026-10-18 15:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Copied from apps.research.services.thumbnails as of this migration, so later
+# changes to how thumbnails are built do not change what it does
+THUMB_SRCSET_WIDTHS = (400, 800, 1200)
+
+def get_image_id(resource):
+    if not resource:
+        return None
+    public_id = resource.public_id if hasattr(resource, 'public_id') else resource
+    try:
+        return public_id.split('/')[-1] or None
+    except AttributeError:
+        return None
+
+def get_cloudinary_url(image_id):
+    if 'f_auto' in image_id or 'q_auto' in image_id:
+        return f"{settings.CLOUDINARY_DOMAIN}/coverImage/{image_id}"
+    return f"{settings.CLOUDINARY_DOMAIN}/f_auto,q_auto,c_scale,h_810/coverImage/{image_id}"
+
+def get_cloudinary_srcset(image_id):
+    return ', '.join(
+        f"{settings.CLOUDINARY_DOMAIN}/f_auto,q_auto,c_scale,w_{width}/coverImage/{image_id} {width}w"
+        for width in THUMB_SRCSET_WIDTHS
+    )
+
+def populate_thumb_urls(apps, schema_editor):
+    """
+    Data migration to precompute the thumbnail URLs of every existing article.
+    """
+    Article = apps.get_model('research', 'Article')
+
+    articles = list(Article.objects.only('id', 'thumb'))
+    for article in articles:
+        image_id = get_image_id(article.thumb)
+        article.thumb_url = get_cloudinary_url(image_id) if image_id else None
+        article.thumb_srcset = get_cloudinary_srcset(image_id) if image_id else None
+    Article.objects.bulk_update(articles, ['thumb_url', 'thumb_srcset'], batch_size=200)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0028_category_article_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='thumb_srcset',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='thumb_url',
+            field=models.URLField(blank=True, editable=False, max_length=500, null=True),
+        ),
+        migrations.RunPython(populate_thumb_urls, migrations.RunPython.noop),
+    ]
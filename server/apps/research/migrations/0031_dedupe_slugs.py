@@ -0,0 +1,40 @@
+# Generated by Django 5.0.8 on 2026-10-18 15:05
+
+from django.db import migrations
+from django.utils.text import slugify
+
+def dedupe_slugs(apps, schema_editor):
+    """
+    Data migration to give every article and category a distinct slug before
+    slugs become unique. The oldest row keeps a shared slug and later ones
+    move to the next free numeric suffix.
+    """
+    for model_name, source_field in (('Article', 'title'), ('Category', 'name')):
+        Model = apps.get_model('research', model_name)
+        taken = set(Model.objects.values_list('slug', flat=True))
+        seen = set()
+
+        for obj in Model.objects.order_by('created_at', 'pk').only('pk', 'slug', source_field):
+            if obj.slug and obj.slug not in seen:
+                seen.add(obj.slug)
+                continue
+
+            base_slug = obj.slug or slugify(getattr(obj, source_field)) or str(obj.pk)[:8]
+            slug = base_slug
+            num = 1
+            while slug in taken:
+                slug = f"{base_slug}-{num}"
+                num += 1
+            taken.add(slug)
+            seen.add(slug)
+            Model.objects.filter(pk=obj.pk).update(slug=slug)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0030_article_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_slugs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.8 on 2026-10-18 15:06
+
+from django.db import migrations, models
+
+def populate_paths(apps, schema_editor):
+    """
+    Data migration to store the materialized path of every existing category.
+    """
+    Category = apps.get_model('research', 'Category')
+
+    categories = list(Category.objects.only('id', 'parent_id'))
+    children = {}
+    for category in categories:
+        children.setdefault(category.parent_id, []).append(category)
+
+    paths = {}
+    queue = [(category, '/') for category in children.get(None, [])]
+    while queue:
+        category, parent_path = queue.pop()
+        paths[category.id] = f'{parent_path}{category.id.hex}/'
+        queue.extend((child, paths[category.id]) for child in children.get(category.id, []))
+
+    for category in categories:
+        # Categories caught in a parent cycle are treated as roots
+        category.path = paths.get(category.id, f'/{category.id.hex}/')
+    Category.objects.bulk_update(categories, ['path'], batch_size=200)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0032_unique_slugs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=1024),
+        ),
+        migrations.RunPython(populate_paths, migrations.RunPython.noop),
+    ]
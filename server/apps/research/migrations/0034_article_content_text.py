@@ -0,0 +1,116 @@
+# Generated by Django 5.0.8 on 2026-10-18 15:07
+
+import lxml.html
+from django.db import migrations, models
+
+# Articles whose content is loaded and written back at once
+BATCH_SIZE = 200
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE research_article ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(content_text, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX research_article_search_vector_idx ON research_article USING GIN (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS research_article_search_vector_idx",
+    "ALTER TABLE research_article DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE research_article_fts USING fts5(
+        article_id UNINDEXED, title, summary, content_text, tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER research_article_fts_insert AFTER INSERT ON research_article BEGIN
+        INSERT INTO research_article_fts (article_id, title, summary, content_text)
+        VALUES (new.id, new.title, coalesce(new.summary, ''), new.content_text);
+    END
+    """,
+    """
+    CREATE TRIGGER research_article_fts_update AFTER UPDATE OF title, summary, content_text ON research_article BEGIN
+        DELETE FROM research_article_fts WHERE article_id = old.id;
+        INSERT INTO research_article_fts (article_id, title, summary, content_text)
+        VALUES (new.id, new.title, coalesce(new.summary, ''), new.content_text);
+    END
+    """,
+    """
+    CREATE TRIGGER research_article_fts_delete AFTER DELETE ON research_article BEGIN
+        DELETE FROM research_article_fts WHERE article_id = old.id;
+    END
+    """,
+    """
+    INSERT INTO research_article_fts (article_id, title, summary, content_text)
+    SELECT id, title, coalesce(summary, ''), content_text FROM research_article
+    """,
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS research_article_fts_insert",
+    "DROP TRIGGER IF EXISTS research_article_fts_update",
+    "DROP TRIGGER IF EXISTS research_article_fts_delete",
+    "DROP TABLE IF EXISTS research_article_fts",
+]
+
+def html_to_text(content):
+    """
+    Copied from apps.research.text as of this migration, so later changes to
+    how the text is extracted do not change what it does.
+    """
+    if not content or not content.strip():
+        return ''
+    root = lxml.html.fragment_fromstring(content, create_parent='div')
+    for element in list(root.iter('script', 'style')):
+        element.drop_tree()
+    return ' '.join(' '.join(root.itertext()).split())
+
+def populate_content_text(apps, schema_editor):
+    """
+    Data migration to store the plain text of every existing article's content.
+    """
+    Article = apps.get_model('research', 'Article')
+
+    articles = Article.objects.only('id', 'content').order_by('pk')
+    last_pk = None
+    while True:
+        batch = list((articles if last_pk is None else articles.filter(pk__gt=last_pk))[:BATCH_SIZE])
+        if not batch:
+            break
+        for article in batch:
+            article.content_text = html_to_text(article.content)
+        Article.objects.bulk_update(batch, ['content_text'])
+        last_pk = batch[-1].pk
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0033_category_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='content_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(populate_content_text, migrations.RunPython.noop),
+        # The search index lives outside the model so it can be vendor specific:
+        # a generated, GIN indexed tsvector on Postgres and an FTS5 table on SQLite
+        migrations.RunPython(
+            run_statements({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            run_statements({'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE}),
+        ),
+    ]
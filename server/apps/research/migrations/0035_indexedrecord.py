@@ -0,0 +1,27 @@
+# Generated by Django 5.0.8 on 2026-10-18 15:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0034_article_content_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexedRecord',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('index_name', models.CharField(max_length=255)),
+                ('object_id', models.CharField(max_length=64)),
+                ('record_hash', models.CharField(max_length=64)),
+                ('pushed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'research_indexedrecord',
+                'unique_together': {('index_name', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+OLD_INDEX = models.Index(fields=['status', '-scheduled_publish_time', '-id'], name='article_status_publish_idx')
+NEW_INDEX = models.Index(
+    models.F('status'),
+    models.F('scheduled_publish_time').desc(nulls_last=True),
+    models.F('id').desc(),
+    name='article_status_publish_idx',
+)
+
+def replace_index(old, new):
+    def run(apps, schema_editor):
+        # Other databases cannot put NULLS LAST in an index, and SQLite
+        # already sorts NULLs last in descending order
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        Article = apps.get_model('research', 'Article')
+        schema_editor.remove_index(Article, old)
+        schema_editor.add_index(Article, new)
+    return run
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0035_indexedrecord'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveIndex(model_name='article', name='article_status_publish_idx'),
+                migrations.AddIndex(model_name='article', index=NEW_INDEX),
+            ],
+            database_operations=[
+                migrations.RunPython(replace_index(OLD_INDEX, NEW_INDEX), replace_index(NEW_INDEX, OLD_INDEX)),
+            ],
+        ),
+    ]
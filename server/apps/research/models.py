@@ -2,6 +2,6 @@
 
 from .category import Category
 from .author import Author
-from .article import Article, ArticleSlugHistory
+from .article import Article, ArticleSlugHistory, ArticleRecommendation
 
-__all__ = ['Category', 'Author', 'Article', 'ArticleSlugHistory']
+__all__ = ['Category', 'Author', 'Article', 'ArticleSlugHistory', 'ArticleRecommendation']
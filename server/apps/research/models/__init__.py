@@ -1,3 +1,4 @@
 from .category import Category
 from .author import Author
-from .article import Article, ArticleSlugHistory
\ No newline at end of file
+from .article import Article, ArticleSlugHistory, ArticleRecommendation
+from .indexed_record import IndexedRecord
\ No newline at end of file
@@ -3,15 +3,8 @@ from algoliasearch_django.decorators import register
 from .article import Article
 from .author import Author
 from .category import Category
-from bs4 import BeautifulSoup
-
-def truncate_text(text, max_chars=8000):
-    """Truncate text to stay within Algolia's size limits"""
-    if not text:
-        return ""
-    if len(text) <= max_chars:
-        return text
-    return text[:max_chars] + "..."
+from django.db.models import Prefetch
+from apps.research.services.algolia_records import build_article_record, truncate_text
 
 @register(Article)
 class ArticleIndex(AlgoliaIndex):
@@ -44,57 +37,63 @@ class ArticleIndex(AlgoliaIndex):
         ]
     }
 
-    def get_raw_record(self, instance):
-        record = super().get_raw_record(instance)
-
-        # Convert UUID to string
-        record['objectID'] = str(instance.id)
-
-        # Clean and truncate HTML content
-        if instance.content:
-            soup = BeautifulSoup(instance.content, 'html.parser')
-            clean_content = soup.get_text(separator=' ', strip=True)
-            record['content_excerpt'] = truncate_text(clean_content, 8000)
-
-        if instance.summary:
-            record['summary'] = truncate_text(instance.summary, 1000)
-
-        # Add thumbnail URL
-        if instance.thumb:
-            record['thumb_url'] = instance.thumb.url
+    # Article fields the record is built from, saves that leave them alone are not synced
+    record_fields = (
+        'title', 'slug', 'status', 'views', 'is_sponsored', 'content', 'summary',
+        'thumb', 'scheduled_publish_time',
+    )
 
-        # Handle datetime fields
-        if instance.scheduled_publish_time:
-            record['scheduled_publish_time'] = instance.scheduled_publish_time.isoformat()
-
-        if instance.created_at:
-            record['created_at'] = instance.created_at.isoformat()
-
-        if instance.updated_at:
-            record['updated_at'] = instance.updated_at.isoformat()
-
-        # Handle relationships
-        if instance.categories.exists():
-            record['categories'] = [
+    def get_queryset(self):
+        """Ready articles with everything their records need loaded up front."""
+        return self.index_queryset.defer('content').prefetch_related(
+            'categories',
+            Prefetch('authors', queryset=Author.objects.select_related('user')),
+        )
+
+    def get_record_data(self, instance):
+        """Collect the plain data an article record is built from."""
+        def isoformat(value):
+            return value.isoformat() if value else None
+
+        authors = instance.authors.all()
+        if 'authors' not in getattr(instance, '_prefetched_objects_cache', {}):
+            authors = authors.select_related('user')
+
+        fields = super().get_raw_record(instance)
+        del fields['objectID']
+        return {
+            'id': str(instance.id),
+            'fields': fields,
+            'content_text': instance.content_text,
+            'summary': instance.summary,
+            'thumb_url': instance.thumb_url,
+            'thumb_srcset': instance.thumb_srcset,
+            'scheduled_publish_time': isoformat(instance.scheduled_publish_time),
+            'created_at': isoformat(instance.created_at),
+            'updated_at': isoformat(instance.updated_at),
+            # all() reads the prefetched relations when the queryset loaded them
+            'categories': [
                 {
-                    'name': category.name, 
+                    'name': category.name,
                     'slug': category.slug,
                     'id': str(category.id)
                 }
                 for category in instance.categories.all()
-            ]
-
-        if instance.authors.exists():
-            record['authors'] = [
+            ],
+            'authors': [
                 {
                     'name': author.full_name or author.user.get_full_name(),
                     'username': author.user.username,
                     'id': str(author.id)
                 }
-                for author in instance.authors.all()
-            ]
-
-        return record
+                for author in authors
+            ],
+        }
+
+    def get_raw_record(self, instance, update_fields=None):
+        if update_fields:
+            return super().get_raw_record(instance, update_fields=update_fields)
+        return build_article_record(self.get_record_data(instance))
 
 @register(Category)
 class CategoryIndex(AlgoliaIndex):
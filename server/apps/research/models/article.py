@@ -3,13 +3,18 @@ from django.utils.text import slugify
 from django.core.exceptions import ValidationError
 from apps.common.models import BaseModel
 from apps.research.managers import ArticleObjects
+from apps.research.cache import index_article_identifiers
+from apps.research.text import html_to_text, set_heading_ids
+from apps.research.slugs import next_free_slug, save_with_free_slug
+from apps.research.services.thumbnails import get_cloudinary_url, get_cloudinary_srcset
 from .category import Category
 from .author import Author
 from django.utils import timezone
 from django.conf import settings
 from tinymce.models import HTMLField
 import json
-from bs4 import BeautifulSoup
+import hashlib
+import lxml.html
 import uuid
 from django.db import transaction
 from cloudinary.models import CloudinaryField
@@ -17,6 +22,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+WORDS_PER_MINUTE = 300
+# Number of related articles stored for each article
+RELATED_ARTICLES_COUNT = 3
+# Slugs that name article collection routes instead of an article
+RESERVED_SLUGS = ('search', 'categories')
+# Order of the article feeds, newest first with unscheduled articles last, matching article_status_publish_idx
+PUBLISHED_ORDERING = (models.F('scheduled_publish_time').desc(nulls_last=True), models.F('id').desc())
+
 def get_default_thumb():
     return "v1734517759/v4_article_cover_slashing_hhf6tz"
 
@@ -34,7 +47,7 @@ class Article(BaseModel):
     gpt_summary = HTMLField(blank=True, null=True)
     acknowledgement = HTMLField(blank=True, null=True)
     authors = models.ManyToManyField(Author, blank=True, related_name='articles')
-    slug = models.SlugField(max_length=255, blank=True, db_index=True)
+    slug = models.SlugField(max_length=255, blank=True, unique=True)
     categories = models.ManyToManyField(Category, blank=True, related_name='articles')
     primary_category = models.ForeignKey(
         Category,
@@ -44,10 +57,17 @@ class Article(BaseModel):
         related_name='primary_for_articles'
     )
     thumb = CloudinaryField('image', folder='coverImage', default=get_default_thumb, blank=True)
+    thumb_url = models.URLField(max_length=500, blank=True, null=True, editable=False)
+    thumb_srcset = models.TextField(blank=True, null=True, editable=False)
     views = models.PositiveBigIntegerField(default=0)
     status = models.CharField(max_length=10, choices=options, default='draft', db_index=True)    
     scheduled_publish_time = models.DateTimeField(null=True, blank=True, db_index=True)    
     table_of_contents = models.JSONField(default=list, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+    # Plain text of the content, kept for search
+    content_text = models.TextField(blank=True, default='', editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    min_read = models.PositiveIntegerField(default=1, editable=False)
     is_sponsored = models.BooleanField(default=False)
     sponsor_color = models.CharField(max_length=7, default="#FF0420")
     sponsor_text_color = models.CharField(max_length=7, default="#000000")
@@ -65,6 +85,14 @@ class Article(BaseModel):
 
     class Meta:
         ordering = ('-scheduled_publish_time',)
+        indexes = [
+            models.Index(
+                models.F('status'),
+                models.F('scheduled_publish_time').desc(nulls_last=True),
+                models.F('id').desc(),
+                name='article_status_publish_idx'
+            ),
+        ]
     
     def clean(self):
         super().clean()
@@ -72,131 +100,195 @@ class Article(BaseModel):
             raise ValidationError({'related_articles': 'You can select up to 3 related articles only.'})
 
     def calculate_min_read(self):
-        if not self.content:
-            return 1
-        word_count = len(self.content.split())
-        words_per_minute = 300
-        minutes = max(1, round(word_count / words_per_minute))
-        return minutes
-
-    min_read = property(calculate_min_read)
+        """Compute the word count and reading time from the stored plain text of the content."""
+        self.word_count = len(self.content_text.split())
+        self.min_read = max(1, round(self.word_count / WORDS_PER_MINUTE))
+        return self.min_read
 
     def __str__(self):
         return self.title
 
     def build_table_of_contents(self):
-        """Build the table of contents from the article content."""
+        """Build the table of contents from the article content and anchor its headings."""
         try:
-            if not self.content:
+            if not self.content or not self.content.strip():
                 self.table_of_contents = []
                 return
 
-            soup = BeautifulSoup(self.content, 'html.parser')
-            headers = soup.find_all(['h1', 'h2', 'h3'])
-            
+            root = lxml.html.fragment_fromstring(self.content, create_parent='div')
+
             toc = []
             stack = [{'level': 0, 'children': toc}]
+            ids = []
+            changed = False
 
-            for header in headers:
-                level = int(header.name[1])
-                title = header.get_text()
-                header['id'] = slugify(title)
+            for header in root.iter('h1', 'h2', 'h3'):
+                level = int(header.tag[1])
+                title = header.text_content()
+                ids.append(slugify(title))
+                changed = changed or header.get('id') != ids[-1]
 
                 while level <= stack[-1]['level']:
                     stack.pop()
 
-                new_item = {'title': title, 'id': header['id'], 'children': []}
-                
+                new_item = {'title': title, 'id': ids[-1], 'children': []}
+
                 stack[-1]['children'].append(new_item)
                 stack.append({'level': level, 'children': new_item['children']})
 
             self.table_of_contents = toc
-            self.content = str(soup)
+            # The parsed tree is only read: the parser restructures invalid
+            # nesting, so the content is edited in place and only where needed
+            if changed:
+                self.content = set_heading_ids(self.content, ids)
         except Exception as e:
             logger.error(f"Error building table of contents: {str(e)}", exc_info=True)
             self.table_of_contents = []
 
+    @staticmethod
+    def hash_content(content):
+        return hashlib.sha256((content or '').encode('utf-8')).hexdigest()
+
     def get_related_articles(self):
         """
-        Returns manually selected related articles if they exist,
-        otherwise falls back to automatic recommendations
+        Returns the precomputed related articles: the manually selected ones
+        if they exist, otherwise the automatic recommendations.
         """
         try:
-            manual_related = self.related_articles.filter(status='ready').order_by('-scheduled_publish_time')[:3]
-            
-            if manual_related.exists():
-                return manual_related
-                
             return Article.objects.filter(
+                recommended_for__article=self,
+                status='ready'
+            ).order_by('recommended_for__position')
+        except Exception as e:
+            logger.error(f"Error getting related articles: {str(e)}", exc_info=True)
+            return Article.objects.none()
+
+    def compute_related_article_ids(self):
+        """
+        Compute up to three related article ids, preferring manually selected
+        related articles over the latest articles sharing a category.
+        """
+        manual_related = list(
+            self.related_articles.filter(status='ready')
+            .order_by('-scheduled_publish_time')
+            .values_list('id', flat=True)[:RELATED_ARTICLES_COUNT]
+        )
+        if manual_related:
+            return manual_related
+
+        return list(
+            Article.objects.filter(
                 status='ready',
                 categories__in=self.categories.all()
             ).exclude(
                 id=self.id
-            ).distinct().order_by('-scheduled_publish_time')[:3]
-        except Exception as e:
-            logger.error(f"Error getting related articles: {str(e)}", exc_info=True)
-            return Article.objects.none()
+            ).distinct().order_by('-scheduled_publish_time').values_list('id', flat=True)[:RELATED_ARTICLES_COUNT]
+        )
+
+    def refresh_recommendations(self):
+        """
+        Recompute and store the related articles shown for this article.
+        Returns whether they changed.
+        """
+        related_ids = self.compute_related_article_ids()
+        stored_ids = list(self.recommendations.order_by('position').values_list('recommended_id', flat=True))
+        if stored_ids == related_ids:
+            return False
+        with transaction.atomic():
+            ArticleRecommendation.objects.filter(article=self).delete()
+            ArticleRecommendation.objects.bulk_create([
+                ArticleRecommendation(article=self, recommended_id=related_id, position=position)
+                for position, related_id in enumerate(related_ids)
+            ])
+        return True
 
     def _ensure_primary_category(self):
         """Ensure that the article has a primary category."""
         try:
-            if not self.categories.exists():
+            if self.primary_category_id or self._state.adding:
                 return
 
-            if not self.primary_category:
-                self.primary_category = self.categories.first()
+            self.primary_category = self.categories.first()
         except Exception as e:
             logger.error(f"Error ensuring primary category: {str(e)}", exc_info=True)
 
-    def title_update(self):
-        """Check if the title has changed."""
-        if not self.pk:
-            return True
-        try:
-            original = Article.objects.get(pk=self.pk)
-            return original.title != self.title
-        except Article.DoesNotExist:
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what was loaded so that save() can tell which fields changed
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._remember_loaded_values(fields)
+
+    def _remember_loaded_values(self, fields=None):
+        loaded = getattr(self, '_loaded_values', {})
+        for field in self._meta.concrete_fields:
+            if (fields is None or field.name in fields or field.attname in fields) and field.attname in self.__dict__:
+                loaded[field.attname] = self.__dict__[field.attname]
+        self._loaded_values = loaded
+
+    def field_changed(self, name):
+        """Return whether a field differs from the value it was loaded with."""
+        loaded = getattr(self, '_loaded_values', None)
+        if self._state.adding or loaded is None:
             return True
-        except Exception as e:
-            logger.error(f"Error checking title update: {str(e)}", exc_info=True)
-            return False
+        attname = self._meta.get_field(name).attname
+        if attname not in loaded:
+            # A deferred field only counts as changed once it is assigned
+            return attname in self.__dict__
+        return loaded[attname] != self.__dict__.get(attname, loaded[attname])
+
+    def changed_on_save(self, *names):
+        """Return whether the save being signalled changed any of the named fields."""
+        changed = getattr(self, '_changed_fields', None)
+        return changed is None or any(name in changed for name in names)
 
     def _handle_slug(self):
         """Handle slug generation and history."""
         try:
-            needs_new_slug = not self.slug or self.title_update()
-            
-            if needs_new_slug:
-                new_slug = self.generate_unique_slug()
-                
-                if self.pk:
-                    try:
-                        with transaction.atomic():
-                            old_instance = Article.objects.get(pk=self.pk)
-                            old_slug = old_instance.slug
-                            
-                            if (old_slug and old_slug != new_slug and 
-                                not ArticleSlugHistory.objects.filter(
-                                    article=self,
-                                    old_slug=old_slug
-                                ).exists()):
-                                ArticleSlugHistory.objects.create(
-                                    article=self,
-                                    old_slug=old_slug
-                                )
-                    except Article.DoesNotExist:
-                        pass
-                
-                self.slug = new_slug
-                
+            self._slug_generated = not self.slug or self.field_changed('title') or self.slug in RESERVED_SLUGS
+            if self._slug_generated:
+                self.slug = self.generate_unique_slug()
+
+            if self._state.adding:
+                transaction.on_commit(self._index_identifiers)
+            elif self.field_changed('slug'):
+                old_slug = self._loaded_values.get('slug')
+                if old_slug:
+                    ArticleSlugHistory.objects.bulk_create(
+                        [ArticleSlugHistory(article=self, old_slug=old_slug)], ignore_conflicts=True
+                    )
+                transaction.on_commit(self._index_identifiers)
+
         except Exception as e:
             logger.error(f"Error handling slug: {str(e)}", exc_info=True)
             raise
 
+    def _index_identifiers(self):
+        """Point the article's UUID, slug and historical slugs at its current slug."""
+        # Current slugs win over historical ones, so skip old slugs another article has taken since
+        old_slugs = self.slug_history.exclude(
+            old_slug__in=Article.objects.exclude(pk=self.pk).values('slug')
+        ).values_list('old_slug', flat=True)
+        index_article_identifiers(self.pk, self.slug, list(old_slugs))
+
+    def _content_changed(self):
+        """Return whether the content differs from the content the TOC was last built for."""
+        if not self.field_changed('content'):
+            return False
+        return self.hash_content(self.content) != self.content_hash
+
     def _build_table_of_contents(self):
-        """Build the table of contents if content exists."""
-        if self.content:
-            self.build_table_of_contents()
+        """Build the table of contents and reading time when the content changed."""
+        if not self._content_changed():
+            return
+        self.build_table_of_contents()
+        self.content_text = html_to_text(self.content)
+        self.calculate_min_read()
+        self.content_hash = self.hash_content(self.content)
 
     def _handle_scheduled_publish(self):
         """Handle scheduled publish logic."""
@@ -216,6 +308,11 @@ class Article(BaseModel):
             logger.error(f"Error validating thumbnail: {str(e)}", exc_info=True)
             raise ValidationError(f"Image upload failed: {str(e)}") from e
 
+    def build_thumb_urls(self):
+        """Store the optimized delivery URL and responsive srcset of the thumbnail."""
+        self.thumb_url = get_cloudinary_url(self.thumb)
+        self.thumb_srcset = get_cloudinary_srcset(self.thumb)
+
     def save(self, *args, **kwargs):
         """Override the save method to generate a unique slug, build table of contents, and set primary category."""
         try:
@@ -228,7 +325,7 @@ class Article(BaseModel):
             logger.info(f"Slug handled: {self.slug}")
             
             self._build_table_of_contents()
-            logger.info("Table of contents built")
+            logger.info(f"Table of contents and reading time ({self.min_read} min) up to date")
             
             self._handle_scheduled_publish()
             logger.info(f"Scheduled publish handled: {self.status}")
@@ -236,7 +333,18 @@ class Article(BaseModel):
             self._validate_thumbnail()
             logger.info("Thumbnail validated")
 
-            super().save(*args, **kwargs)
+            if self.field_changed('thumb'):
+                self.build_thumb_urls()
+                logger.info("Thumbnail URLs built")
+
+            self._changed_fields = None if self._state.adding else {
+                field.name for field in self._meta.concrete_fields if self.field_changed(field.name)
+            }
+            if self._slug_generated:
+                save_with_free_slug(self, lambda: super(Article, self).save(*args, **kwargs), self.generate_unique_slug)
+            else:
+                super().save(*args, **kwargs)
+            self._remember_loaded_values(kwargs.get('update_fields'))
             logger.info("Save completed successfully")
             
         except Exception as e:
@@ -250,12 +358,7 @@ class Article(BaseModel):
             if not base_slug:
                 base_slug = str(uuid.uuid4())[:8]
             
-            slug = base_slug
-            num = 1
-            while Article.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{num}"
-                num += 1
-            return slug
+            return next_free_slug(Article.objects.exclude(pk=self.pk), base_slug, reserved=RESERVED_SLUGS)
         except Exception as e:
             logger.error(f"Error generating unique slug: {str(e)}", exc_info=True)
             raise
@@ -275,4 +378,19 @@ class ArticleSlugHistory(models.Model):
         db_table = 'research_articleslughistory'
 
     def __str__(self):
-        return f"{self.old_slug} -> {self.article.slug}"
\ No newline at end of file
+        return f"{self.old_slug} -> {self.article.slug}"
+
+class ArticleRecommendation(models.Model):
+    """Model to store the precomputed related articles of an article."""
+    id = models.AutoField(primary_key=True)
+    article = models.ForeignKey('Article', on_delete=models.CASCADE, related_name='recommendations')
+    recommended = models.ForeignKey('Article', on_delete=models.CASCADE, related_name='recommended_for')
+    position = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ('position',)
+        unique_together = ('article', 'position')
+        db_table = 'research_articlerecommendation'
+
+    def __str__(self):
+        return f"{self.article.slug} -> {self.recommended.slug}"
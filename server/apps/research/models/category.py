@@ -1,29 +1,75 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Substr
+from django.db import transaction
 from apps.common.models import BaseModel
 from django.utils.text import slugify
-from django.db import transaction
+from apps.research.slugs import next_free_slug, save_with_free_slug
 from django.core.exceptions import ValidationError
 
 class Category(BaseModel):
     """Model for categories."""
     name = models.CharField(max_length=255)
-    slug = models.SlugField(max_length=255, blank=True)
+    slug = models.SlugField(max_length=255, blank=True, unique=True)
     is_primary = models.BooleanField(default=False)
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='children')
+    article_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+    # Materialized path of the ids from the root down to this category, e.g. "/<root>/<child>/"
+    path = models.CharField(max_length=1024, blank=True, editable=False, db_index=True)
 
     class Meta:
         verbose_name_plural = 'Categories'
+
+    @classmethod
+    def refresh_article_counts(cls, category_ids=None):
+        """Recount the ready articles of the given categories, or of all categories, in one UPDATE."""
+        ready_counts = cls.articles.through.objects.filter(
+            category_id=OuterRef('pk'), article__status='ready'
+        ).order_by().values('category_id').annotate(total=Count('article_id')).values('total')
+        categories = cls.objects.all()
+        if category_ids is not None:
+            categories = categories.filter(pk__in=category_ids)
+        return categories.update(article_count=Coalesce(Subquery(ready_counts), Value(0)))
         
     def save(self, *args, **kwargs):
+        slug_generated = not self.slug
+        try:
+            if slug_generated:
+                self.slug = self.generate_slug()
+            if len(self.slug) > 255:
+                raise ValueError("Generated slug exceeds maximum length")
+        except ValueError as e:
+            raise ValueError(f"Failed to generate valid slug") from e
+
+        old_path, self.path = self.path, self.build_path()
+
         with transaction.atomic():
-            try:
-                if not self.slug:
-                    self.slug = self.generate_slug()
-                if len(self.slug) > 255:
-                    raise ValueError("Generated slug exceeds maximum length")
-            except ValueError as e:
-                raise ValueError(f"Failed to generate valid slug") from e
-            super().save(*args, **kwargs)
+            if slug_generated:
+                save_with_free_slug(self, lambda: super(Category, self).save(*args, **kwargs), self.generate_slug)
+            else:
+                super().save(*args, **kwargs)
+
+            if old_path and old_path != self.path:
+                # Move the whole subtree along with this category in one statement
+                Category.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(self.path), Substr('path', len(old_path) + 1))
+                )
+
+    def build_path(self):
+        parent_path = self.parent.path if self.parent_id else '/'
+        return f'{parent_path}{self.pk.hex}/'
+
+    def get_ancestors(self, include_self=False):
+        """Return the categories above this one, read from the path in a single query."""
+        ids = [part for part in self.path.strip('/').split('/') if part]
+        if not include_self:
+            ids = ids[:-1]
+        return Category.objects.filter(pk__in=ids)
+
+    def get_descendants(self, include_self=False):
+        """Return every category below this one in a single query."""
+        descendants = Category.objects.filter(path__startswith=self.path)
+        return descendants if include_self else descendants.exclude(pk=self.pk)
 
     def __str__(self):
         return self.name
@@ -33,28 +79,14 @@ class Category(BaseModel):
             raise ValueError("Name is required to generate slug")
 
         base_slug = slugify(self.name)
-        slug = base_slug
-        num = 1
-        with transaction.atomic():
-            while (
-                Category.objects.select_for_update()
-                .filter(slug=slug)
-                .exclude(id=self.id)
-                .exists()
-            ):
-                slug = f"{base_slug}-{num}"
-                num += 1
-        return slug
+        return next_free_slug(Category.objects.exclude(id=self.id), base_slug)
 
     def clean(self):
         if self.parent == self:
             raise ValidationError('A category cannot be its own parent')
         
-        parent = self.parent
-        while parent is not None:
-            if parent == self:
-                raise ValidationError('Circular reference detected in category hierarchy')
-            parent = parent.parent
+        if self.parent is not None and self.path and self.parent.path.startswith(self.path):
+            raise ValidationError('Circular reference detected in category hierarchy')
         
         if self.is_primary and self.parent is not None:
             raise ValidationError('Primary categories cannot have parent categories')
@@ -0,0 +1,16 @@
+from django.db import models
+
+class IndexedRecord(models.Model):
+    """Model to store a hash of the last record pushed to an Algolia index for an object."""
+    id = models.AutoField(primary_key=True)
+    index_name = models.CharField(max_length=255)
+    object_id = models.CharField(max_length=64)
+    record_hash = models.CharField(max_length=64)
+    pushed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('index_name', 'object_id')
+        db_table = 'research_indexedrecord'
+
+    def __str__(self):
+        return f"{self.index_name}/{self.object_id}"
@@ -1,5 +1,9 @@
 from django.contrib.syndication.views import Feed
-from .models import Article
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from .models import Article, Author
+from .cache import get_cached_rss_feed, set_cached_rss_feed
+from .conditional import collection_validators, not_modified_response, apply_validators
 from django.conf import settings
 
 class LatestArticlesFeed(Feed):
@@ -9,7 +13,31 @@ class LatestArticlesFeed(Feed):
     def __call__(self, request, *args, **kwargs):
         # Store the request object for use in other methods
         self.request = request
-        return super().__call__(request, *args, **kwargs)
+        # The rendered feed is cached per host, as its links are absolute, until an article,
+        # author or category changes and moves the research cache generation on
+        host = request.build_absolute_uri('/')
+        feed = get_cached_rss_feed(host)
+        if feed is not None:
+            response = not_modified_response(request, feed['etag'], feed['last_modified'])
+            if response is not None:
+                return response
+            response = HttpResponse(feed['content'], content_type=feed['content_type'])
+            return apply_validators(response, feed['etag'], feed['last_modified'])
+
+        # Answer conditional requests before any item is rendered
+        etag, last_modified = collection_validators(request)
+        response = not_modified_response(request, etag, last_modified)
+        if response is not None:
+            return response
+        response = super().__call__(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_cached_rss_feed(host, {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'etag': etag,
+                'last_modified': last_modified,
+            })
+        return apply_validators(response, etag, last_modified)
 
     def link(self):
         # Dynamically generate the link for the RSS feed using the request object
@@ -18,7 +46,12 @@ class LatestArticlesFeed(Feed):
     def items(self):
         # Return most recent published articles up to configured limit
         limit = getattr(settings, 'RSS_FEED_LIMIT', 10)
-        return Article.objects.filter(status='ready').order_by('-scheduled_publish_time')[:limit]
+        return (
+            Article.objects.filter(status='ready')
+            .only('id', 'title', 'summary', 'slug', 'scheduled_publish_time', 'updated_at')
+            .prefetch_related('categories', Prefetch('authors', queryset=Author.objects.select_related('user')))
+            .order_by('-scheduled_publish_time')[:limit]
+        )
 
     def item_title(self, item):
         # Return the article title
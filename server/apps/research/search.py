@@ -0,0 +1,78 @@
+import re
+from django.db import connection
+from django.db.models import Count, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from .models import Article
+
+# Relative weights of the title, summary and content columns in SQLite's bm25()
+FTS_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def _fts_query(query):
+    """Quote every word of ``query`` so FTS5 reads it as plain terms, all of which must match."""
+    return ' '.join(f'"{term}"' for term in re.findall(r'\w+', query))
+
+
+def search_articles(query, queryset):
+    """
+    Filter ``queryset`` to the articles matching ``query`` and order them by relevance.
+
+    Postgres matches against the generated ``search_vector`` column and SQLite
+    against the ``research_article_fts`` table, both kept up to date by the
+    database itself. Other backends fall back to a substring match.
+    """
+    table = Article._meta.db_table
+    if connection.vendor == 'postgresql':
+        tsquery = "websearch_to_tsquery('english', %s)"
+        queryset = queryset.filter(
+            pk__in=RawSQL(f'SELECT id FROM {table} WHERE search_vector @@ {tsquery}', (query,))
+        ).annotate(
+            search_rank=RawSQL(f'ts_rank({table}.search_vector, {tsquery})', (query,), output_field=FloatField())
+        )
+    elif connection.vendor == 'sqlite':
+        terms = _fts_query(query)
+        if not terms:
+            return queryset.none()
+        weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+        queryset = queryset.filter(
+            pk__in=RawSQL(f'SELECT article_id FROM {table}_fts WHERE {table}_fts MATCH %s', (terms,))
+        ).annotate(
+            search_rank=RawSQL(
+                f'(SELECT -bm25({table}_fts, 0, {weights}) FROM {table}_fts '
+                f'WHERE {table}_fts MATCH %s AND article_id = {table}.id)',
+                (terms,),
+                output_field=FloatField(),
+            )
+        )
+    else:
+        queryset = queryset.filter(
+            Q(title__icontains=query) | Q(summary__icontains=query) | Q(content_text__icontains=query)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+    return queryset.order_by('-search_rank', '-scheduled_publish_time', '-id')
+
+
+def search_facets(articles):
+    """Count the matching articles per category and per author."""
+    matching = articles.order_by().values('pk')
+    categories = (
+        Article.categories.through.objects.filter(article__in=matching)
+        .values('category__slug', 'category__name')
+        .annotate(count=Count('article_id', distinct=True))
+        .order_by('-count', 'category__name')
+    )
+    authors = (
+        Article.authors.through.objects.filter(article__in=matching)
+        .values('author_id', 'author__full_name')
+        .annotate(count=Count('article_id', distinct=True))
+        .order_by('-count', 'author__full_name')
+    )
+    return {
+        'categories': [
+            {'slug': row['category__slug'], 'name': row['category__name'], 'count': row['count']}
+            for row in categories
+        ],
+        'authors': [
+            {'id': row['author_id'], 'full_name': row['author__full_name'], 'count': row['count']}
+            for row in authors
+        ],
+    }
@@ -1,3 +1,5 @@
 from .author_serializer import AuthorSerializer
 from .category_serializer import CategorySerializer
 from .article_serializer import ArticleSerializer, ArticleCreateUpdateSerializer, ArticleListSerializer
+from .projection import deferred_fields, project_queryset
+from .fast import FastSerializerMixin, drf_representation
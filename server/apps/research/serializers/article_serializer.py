@@ -1,51 +1,73 @@
 # article_serializer.py
 import logging
+from collections import defaultdict
+from django.db import models
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
-from ..models import Article, Author, Category
+from ..models import Article, ArticleRecommendation, Author, Category
 from .author_serializer import AuthorSerializer
 from .category_serializer import CategorySerializer
-from django.conf import settings
+from .projection import deferred_fields
+from .fast import FastSerializerMixin
 
-def get_cloudinary_url(resource):
+def load_article_relations(articles):
     """
-    Handles both legacy images and new optimized images.
-    Legacy images: Add optimization parameters
-    New images: Will already have optimization from CloudinaryField config
+    Fetch the authors, their users and the categories of every article in one
+    query per relation, skipping relations that are already loaded.
     """
-    if not resource:
-        return None
-    
-    public_id = resource.public_id if hasattr(resource, 'public_id') else resource
-    try:
-        image_id = public_id.split('/')[-1]
-        if not image_id:
-            raise ValueError("Invalid public_id format")
-    except (AttributeError, IndexError) as e:
-        logging.error(f"Error processing public_id {public_id}: {str(e)}")
-        return None
-    base_url = f"{settings.CLOUDINARY_DOMAIN}/coverImage/{image_id}"
-
-    if 'f_auto' in image_id or 'q_auto' in image_id:
-        return base_url
-    
-    return f"{settings.CLOUDINARY_DOMAIN}/f_auto,q_auto,c_scale,h_810/coverImage/{image_id}"
-
-class RelatedArticleSerializer(serializers.ModelSerializer):
+    prefetch_related_objects(articles, 'authors__user', 'categories')
+
+
+def load_related_articles(articles):
+    """
+    Attach the precomputed related articles of every article as
+    ``batched_related_articles`` using a single query, and return them all.
+    """
+    recommendations = ArticleRecommendation.objects.filter(
+        article__in=articles,
+        recommended__status='ready'
+    ).select_related('recommended').defer(
+        *[f'recommended__{field}' for field in deferred_fields(RelatedArticleSerializer)]
+    ).order_by('position')
+
+    related_by_article = defaultdict(list)
+    for recommendation in recommendations:
+        related_by_article[recommendation.article_id].append(recommendation.recommended)
+
+    related = []
+    for article in articles:
+        article.batched_related_articles = related_by_article[article.pk]
+        related.extend(article.batched_related_articles)
+    return related
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    """List serializer that lets its child load nested relations for all items at once."""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.child.load_relations(items)
+        return super().to_representation(items)
+
+
+class RelatedArticleSerializer(FastSerializerMixin, serializers.ModelSerializer):
     authors = AuthorSerializer(many=True)
     categories = CategorySerializer(many=True)
-    thumb = serializers.SerializerMethodField()
+    thumb = serializers.CharField(source='thumb_url', read_only=True)
 
-    def get_thumb(self, obj):
-        return get_cloudinary_url(obj.thumb)
+    def load_relations(self, articles):
+        load_article_relations(articles)
 
     class Meta:
         model = Article
+        list_serializer_class = BatchedListSerializer
         fields = [
             "id",
             "slug",
             "title",
             "authors",
             "thumb",
+            "thumb_srcset",
             "categories",
             "summary",
             "min_read",
@@ -53,16 +75,17 @@ class RelatedArticleSerializer(serializers.ModelSerializer):
         ]
 
 
-class ArticleListSerializer(serializers.ModelSerializer):
+class ArticleListSerializer(FastSerializerMixin, serializers.ModelSerializer):
     categories = CategorySerializer(many=True)
     authors = AuthorSerializer(many=True)
-    thumb = serializers.SerializerMethodField()
+    thumb = serializers.CharField(source='thumb_url', read_only=True)
 
-    def get_thumb(self, obj):
-        return get_cloudinary_url(obj.thumb)
+    def load_relations(self, articles):
+        load_article_relations(articles)
 
     class Meta:
         model = Article
+        list_serializer_class = BatchedListSerializer
         exclude = [
             "content",
             "scheduled_publish_time",
@@ -74,32 +97,46 @@ class ArticleListSerializer(serializers.ModelSerializer):
             "table_of_contents",
             "gpt_summary",
             "related_articles",
+            "word_count",
+            "thumb_url",
+            "content_hash",
+            "content_text",
         ]
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(FastSerializerMixin, serializers.ModelSerializer):
     authors = AuthorSerializer(many=True, read_only=True)
     categories = CategorySerializer(many=True)
     views = serializers.ReadOnlyField()
     min_read = serializers.ReadOnlyField()
     related_articles = serializers.SerializerMethodField()
-    thumb = serializers.SerializerMethodField()
-
-    def get_thumb(self, obj):
-        return get_cloudinary_url(obj.thumb)
+    thumb = serializers.CharField(source='thumb_url', read_only=True)
 
     def get_related_articles(self, obj):
-        related = obj.get_related_articles()
+        related = getattr(obj, 'batched_related_articles', None)
+        if related is None:
+            related = obj.get_related_articles()
         return RelatedArticleSerializer(related, many=True, context=self.context).data
 
+    def load_relations(self, articles):
+        related = load_related_articles(articles)
+        load_article_relations([*articles, *related])
+
+    def to_representation(self, instance):
+        if not hasattr(instance, 'batched_related_articles'):
+            self.load_relations([instance])
+        return super().to_representation(instance)
+
     class Meta:
         model = Article
+        list_serializer_class = BatchedListSerializer
         fields = [
             "id",
             "slug",
             "title",
             "authors",
             "thumb",
+            "thumb_srcset",
             "categories",
             "summary",
             "acknowledgement",
@@ -1,13 +1,29 @@
+from django.db import models
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
 from ..models import Author
+from .fast import FastSerializerMixin
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorListSerializer(serializers.ListSerializer):
+    """List serializer that loads the users of all authors in one query."""
+
+    def to_representation(self, data):
+        authors = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.child.load_relations(authors)
+        return super().to_representation(authors)
+
+class AuthorSerializer(FastSerializerMixin, serializers.ModelSerializer):
     """Serializer for the Author model."""
     username = serializers.SerializerMethodField()
 
     class Meta:
         model = Author
+        list_serializer_class = AuthorListSerializer
         fields = ['id', 'username', 'full_name', 'bio', 'twitter_username']
 
+    def load_relations(self, authors):
+        # Users already prefetched with the articles are not fetched again
+        prefetch_related_objects(authors, 'user')
+
     def get_username(self, obj):
         return obj.user.username
@@ -1,8 +1,9 @@
 # category_serializer.py
 from rest_framework import serializers
 from ..models import Category
+from .fast import FastSerializerMixin
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(FastSerializerMixin, serializers.ModelSerializer):
     """Serializer for the Category model."""
     slug = serializers.SlugField(read_only=True, max_length=255, help_text='URL-friendly version of the category name.')
     is_primary = serializers.BooleanField(read_only=True)
@@ -0,0 +1,150 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from operator import attrgetter
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils import timezone
+from rest_framework import ISO_8601, fields, serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.settings import api_settings
+
+
+def _identity(value):
+    return value
+
+
+def _uuid_converter(field):
+    if field.uuid_format == 'hex_verbose':
+        return str
+    return field.to_representation
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str) or not timezone.is_aware(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _boolean_converter(field):
+    def convert(value):
+        if value is True or value is False:
+            return value
+        return field.to_representation(value)
+    return convert
+
+
+def _prefetched_getter(source):
+    # Read prefetched relations straight from the cache instead of building a
+    # related manager and cloning its queryset for every instance
+    def get(instance):
+        try:
+            return instance._prefetched_objects_cache[source]
+        except (AttributeError, KeyError):
+            return getattr(instance, source)
+    return get
+
+
+# Converters for fields whose to_representation is a plain type conversion.
+# Only exact classes are listed, so customised subclasses keep their behaviour.
+CONVERTERS = {
+    fields.CharField: lambda field: str,
+    fields.SlugField: lambda field: str,
+    fields.IntegerField: lambda field: int,
+    fields.ReadOnlyField: lambda field: _identity,
+    fields.UUIDField: _uuid_converter,
+    fields.DateTimeField: _datetime_converter,
+    fields.BooleanField: _boolean_converter,
+}
+
+# Per context, so a comparison in one thread or task never changes how others render
+_use_fast_path = ContextVar('research_use_fast_path', default=True)
+
+
+@contextmanager
+def drf_representation():
+    """Render with DRF's generic field-by-field path, e.g. to compare outputs."""
+    token = _use_fast_path.set(False)
+    try:
+        yield
+    finally:
+        _use_fast_path.reset(token)
+
+
+class FastSerializerMixin:
+    """
+    Serializer mixin that renders instances through a plan compiled once per
+    serializer from its fields.
+
+    Simple fields are read with ``attrgetter`` and converted with plain type
+    conversions, nested fast serializers are rendered directly, and every other
+    field goes through its own ``get_attribute``/``to_representation`` exactly
+    as DRF would, so the output is identical to ``Serializer.to_representation``.
+    Nested list serializers skip their list class and hand the items to the
+    child's ``load_relations``, if it has one, so they are loaded the same way.
+    """
+
+    def to_representation(self, instance):
+        if not _use_fast_path.get():
+            return super().to_representation(instance)
+
+        plan = self.__dict__.get('_fast_plan')
+        if plan is None:
+            plan = self._fast_plan = self.compile_plan()
+
+        ret = {}
+        for name, getter, convert, field in plan:
+            if getter is None:
+                try:
+                    attribute = field.get_attribute(instance)
+                except SkipField:
+                    continue
+                check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+                ret[name] = None if check_for_none is None else field.to_representation(attribute)
+            else:
+                value = getter(instance)
+                ret[name] = None if value is None else convert(value)
+        return ret
+
+    def compile_plan(self):
+        plan = []
+        for field in self._readable_fields:
+            getter = convert = None
+            if isinstance(field, serializers.SerializerMethodField):
+                getter, convert = _identity, getattr(self, field.method_name)
+            elif self._is_model_field(field.source):
+                if isinstance(field, serializers.ListSerializer) and isinstance(field.child, FastSerializerMixin):
+                    getter, convert = _prefetched_getter(field.source), self._nested_list_converter(field.child)
+                elif type(field) in CONVERTERS:
+                    getter, convert = attrgetter(field.source), CONVERTERS[type(field)](field)
+            plan.append((field.field_name, getter, convert, field))
+        return plan
+
+    def _is_model_field(self, source):
+        # Methods and properties are left to DRF, which calls simple callables
+        try:
+            self.Meta.model._meta.get_field(source)
+        except (AttributeError, FieldDoesNotExist):
+            return False
+        return True
+
+    @staticmethod
+    def _nested_list_converter(child):
+        load_relations = getattr(child, 'load_relations', None)
+
+        def convert(value):
+            items = list(value.all() if isinstance(value, models.manager.BaseManager) else value)
+            if load_relations is not None:
+                load_relations(items)
+            return [child.to_representation(item) for item in items]
+        return convert
@@ -0,0 +1,29 @@
+# projection.py
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def deferred_fields(serializer_class):
+    """
+    Return the concrete, non-relational model columns a ModelSerializer never renders.
+
+    Method fields are assumed to read the model attribute sharing their name,
+    so those columns are kept.
+    """
+    serializer = serializer_class()
+    rendered = set()
+    for name, field in serializer.fields.items():
+        rendered.add(name if field.source == '*' else field.source.split('.')[0])
+
+    model = serializer_class.Meta.model
+    return tuple(
+        field.name
+        for field in model._meta.concrete_fields
+        if not field.primary_key and not field.is_relation and field.name not in rendered
+    )
+
+
+def project_queryset(queryset, serializer_class):
+    """Defer the columns of ``queryset`` that ``serializer_class`` does not render."""
+    fields = deferred_fields(serializer_class)
+    return queryset.defer(*fields) if fields else queryset
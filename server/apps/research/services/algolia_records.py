@@ -0,0 +1,47 @@
+# Size limits of the text attributes of an article record
+CONTENT_EXCERPT_CHARS = 8000
+SUMMARY_CHARS = 1000
+
+
+def truncate_text(text, max_chars=8000):
+    """Truncate text to stay within Algolia's size limits"""
+    if not text:
+        return ""
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars] + "..."
+
+
+def build_article_record(data):
+    """
+    Turn the plain article data gathered by ``ArticleIndex.get_record_data``
+    into an Algolia record.
+
+    This only works on builtin types and does not touch the database.
+    """
+    record = dict(data['fields'])
+    record['objectID'] = data['id']
+
+    # The plain text is stored with the article, so it only needs truncating
+    if data['content_text']:
+        record['content_excerpt'] = truncate_text(data['content_text'], CONTENT_EXCERPT_CHARS)
+
+    if data['summary']:
+        record['summary'] = truncate_text(data['summary'], SUMMARY_CHARS)
+
+    # Add the precomputed thumbnail URLs
+    if data['thumb_url']:
+        record['thumb_url'] = data['thumb_url']
+        record['thumb_srcset'] = data['thumb_srcset']
+
+    for name in ('scheduled_publish_time', 'created_at', 'updated_at'):
+        if data[name]:
+            record[name] = data[name]
+
+    if data['categories']:
+        record['categories'] = data['categories']
+
+    if data['authors']:
+        record['authors'] = data['authors']
+
+    return record
@@ -1,6 +1,6 @@
-import re
 from django.conf import settings
 from openai import AsyncOpenAI
+from apps.research.text import html_to_text
 
 class GPTService:
     """Service for handling OpenAI GPT API interactions."""
@@ -41,9 +41,6 @@ class GPTService:
             raise Exception(f"Error calling OpenAI API: {str(e)}")
 
     def clear_message(self, message: str) -> str:
-        """Clear the message of any HTML tags, line breaks and multiple whitespaces, replacing them with a single space."""
-        # First remove HTML tags and newlines
-        cleaned = re.sub(r'<[^>]*>|\n', ' ', message)
-        # Then replace multiple whitespaces with a single space
-        return re.sub(r'\s+', ' ', cleaned).strip()
+        """Reduce the message to its text with whitespace collapsed, the same way article content_text is stored."""
+        return html_to_text(message)
 
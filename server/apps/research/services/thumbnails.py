@@ -0,0 +1,51 @@
+import logging
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Widths offered to browsers through the thumbnail srcset
+THUMB_SRCSET_WIDTHS = (400, 800, 1200)
+
+
+def _image_id(resource):
+    """Return the file part of a Cloudinary resource or public id, or None if it has none."""
+    if not resource:
+        return None
+
+    public_id = resource.public_id if hasattr(resource, 'public_id') else resource
+    try:
+        image_id = public_id.split('/')[-1]
+        if not image_id:
+            raise ValueError("Invalid public_id format")
+    except (AttributeError, IndexError, ValueError) as e:
+        logger.error(f"Error processing public_id {public_id}: {str(e)}")
+        return None
+    return image_id
+
+
+def get_cloudinary_url(resource):
+    """
+    Handles both legacy images and new optimized images.
+    Legacy images: Add optimization parameters
+    New images: Will already have optimization from CloudinaryField config
+    """
+    image_id = _image_id(resource)
+    if not image_id:
+        return None
+
+    if 'f_auto' in image_id or 'q_auto' in image_id:
+        return f"{settings.CLOUDINARY_DOMAIN}/coverImage/{image_id}"
+
+    return f"{settings.CLOUDINARY_DOMAIN}/f_auto,q_auto,c_scale,h_810/coverImage/{image_id}"
+
+
+def get_cloudinary_srcset(resource):
+    """Build a srcset of optimized, width-scaled variants of a cover image."""
+    image_id = _image_id(resource)
+    if not image_id:
+        return None
+
+    return ', '.join(
+        f"{settings.CLOUDINARY_DOMAIN}/f_auto,q_auto,c_scale,w_{width}/coverImage/{image_id} {width}w"
+        for width in THUMB_SRCSET_WIDTHS
+    )
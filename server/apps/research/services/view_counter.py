@@ -0,0 +1,121 @@
+import logging
+import threading
+import redis
+from django.conf import settings
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+TOTAL_KEY = 'research:article_views:total:{article_id}'
+# Running totals outlive any cached detail payload they were seeded from, then expire
+TOTAL_TIMEOUT = 60 * 60 * 24
+PENDING_KEY = 'research:article_views:pending'
+FLUSHING_KEY = 'research:article_views:flushing'
+LOCAL_COUNTER_URL = 'locmem://'
+
+
+class RedisViewCounter:
+    """Buffers article views in Redis hashes until they are flushed to the database."""
+
+    def __init__(self, url: str):
+        self.client = redis.Redis.from_url(url)
+
+    def record_view(self, article_id, persisted_views: int) -> int:
+        """Count one view and return the article's running total."""
+        key = str(article_id)
+        total_key = TOTAL_KEY.format(article_id=key)
+        pipe = self.client.pipeline()
+        pipe.set(total_key, persisted_views, nx=True, ex=TOTAL_TIMEOUT)
+        pipe.incr(total_key)
+        pipe.expire(total_key, TOTAL_TIMEOUT)
+        pipe.hincrby(PENDING_KEY, key, 1)
+        _, total, _, _ = pipe.execute()
+        return total
+
+    def take_pending(self) -> dict:
+        """
+        Move the pending increments aside and return them.
+
+        Increments left over from a flush that never acknowledged are returned
+        first, so a failed flush is retried instead of being overwritten.
+        """
+        if not self.client.exists(FLUSHING_KEY):
+            try:
+                self.client.rename(PENDING_KEY, FLUSHING_KEY)
+            except redis.ResponseError:
+                # Nothing has been viewed since the last flush
+                return {}
+        return {
+            article_id.decode(): int(count)
+            for article_id, count in self.client.hgetall(FLUSHING_KEY).items()
+        }
+
+    def ack(self):
+        """Forget the increments returned by the last take_pending call."""
+        self.client.delete(FLUSHING_KEY)
+
+
+class DirectViewCounter:
+    """Writes every view straight to the database when no shared buffer is configured."""
+
+    def record_view(self, article_id, persisted_views: int) -> int:
+        from apps.research.models import Article
+
+        Article.objects.filter(pk=article_id).update(views=F('views') + 1)
+        return persisted_views + 1
+
+    def take_pending(self) -> dict:
+        return {}
+
+    def ack(self):
+        pass
+
+
+class LocalViewCounter:
+    """
+    In-process counter store for tests. Views buffered by one process are only
+    flushed by that process, so it must not be used with several workers.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = {}
+        self.pending = {}
+        self.flushing = {}
+
+    def record_view(self, article_id, persisted_views: int) -> int:
+        key = str(article_id)
+        with self.lock:
+            self.totals[key] = self.totals.get(key, persisted_views) + 1
+            self.pending[key] = self.pending.get(key, 0) + 1
+            return self.totals[key]
+
+    def take_pending(self) -> dict:
+        with self.lock:
+            if not self.flushing:
+                self.flushing, self.pending = self.pending, {}
+            return dict(self.flushing)
+
+    def ack(self):
+        with self.lock:
+            self.flushing = {}
+
+
+_counter = None
+
+
+def get_view_counter():
+    """
+    Return the configured view counter: Redis when a URL is set, the in-process
+    buffer for ``locmem://`` and direct database updates otherwise.
+    """
+    global _counter
+    if _counter is None:
+        url = getattr(settings, 'ARTICLE_VIEW_COUNTER_URL', '')
+        if url == LOCAL_COUNTER_URL:
+            _counter = LocalViewCounter()
+        elif url:
+            _counter = RedisViewCounter(url)
+        else:
+            _counter = DirectViewCounter()
+    return _counter
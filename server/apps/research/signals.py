@@ -0,0 +1,195 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from .models import Article, Author, Category
+from .cache import invalidate_research_cache, forget_article_identifiers
+from .tasks import refresh_related_articles
+from .indexing import queue_index_update
+from .typeahead import update_typeahead
+from .models.algolia_index import ArticleIndex
+
+
+def _invalidate_on_commit():
+    transaction.on_commit(invalidate_research_cache)
+
+
+def _refresh_related_on_commit(article_ids):
+    article_ids = [str(article_id) for article_id in article_ids]
+    if article_ids:
+        transaction.on_commit(lambda: refresh_related_articles.delay(article_ids))
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_on_model_change(sender, instance, **kwargs):
+    """Drop cached responses whenever an article or one of its relations changes."""
+    _invalidate_on_commit()
+
+
+@receiver(m2m_changed, sender=Article.authors.through)
+@receiver(m2m_changed, sender=Article.categories.through)
+@receiver(m2m_changed, sender=Article.related_articles.through)
+def invalidate_on_relation_change(sender, instance, action, **kwargs):
+    """Drop cached responses when an article's authors, categories or related articles change."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _invalidate_on_commit()
+
+
+@receiver(post_delete, sender=Article)
+def forget_deleted_article(sender, instance, **kwargs):
+    """Stop resolving a deleted article's UUID and slug."""
+    transaction.on_commit(lambda: forget_article_identifiers(instance.pk, instance.slug))
+
+
+@receiver(post_save, sender=Article)
+def refresh_related_on_save(sender, instance, **kwargs):
+    """Recompute recommendations once an article is created, published or rescheduled."""
+    if instance.changed_on_save('status', 'scheduled_publish_time'):
+        _refresh_related_on_commit([instance.pk])
+
+
+@receiver(m2m_changed, sender=Article.categories.through)
+@receiver(m2m_changed, sender=Article.related_articles.through)
+def refresh_related_on_relation_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recompute recommendations when an article is recategorized or its manual picks change."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        _refresh_related_on_commit([instance.pk])
+    elif pk_set:
+        _refresh_related_on_commit(pk_set)
+
+
+@receiver(pre_delete, sender=Article)
+def refresh_related_on_delete(sender, instance, **kwargs):
+    """Refill the recommendations that pointed at a deleted article."""
+    _refresh_related_on_commit(
+        instance.recommended_for.exclude(article=instance).values_list('article_id', flat=True)
+    )
+
+
+@receiver(post_save, sender=Article)
+def refresh_category_counts_on_save(sender, instance, created, **kwargs):
+    """Keep the ready-article counts of an article's categories in step with its status."""
+    if not created and instance.changed_on_save('status'):
+        Category.refresh_article_counts(instance.categories.values('pk'))
+
+
+@receiver(m2m_changed, sender=Article.categories.through)
+def refresh_category_counts_on_relation_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recount the categories an article was added to or removed from."""
+    if action == 'pre_clear':
+        # The cleared rows are gone by post_clear, so remember what they pointed at
+        instance._cleared_category_ids = (
+            [instance.pk] if reverse else list(instance.categories.values_list('pk', flat=True))
+        )
+    elif action == 'post_clear':
+        Category.refresh_article_counts(getattr(instance, '_cleared_category_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        Category.refresh_article_counts([instance.pk] if reverse else pk_set)
+
+
+@receiver(pre_delete, sender=Article)
+def remember_categories_on_delete(sender, instance, **kwargs):
+    instance._deleted_category_ids = list(instance.categories.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Article)
+def refresh_category_counts_on_delete(sender, instance, **kwargs):
+    """Drop a deleted article from its categories' counts."""
+    Category.refresh_article_counts(getattr(instance, '_deleted_category_ids', []))
+
+
+@receiver(post_save, sender=Article)
+def sync_article_record_on_save(sender, instance, **kwargs):
+    """Queue an Algolia sync when a save touched the fields an article record is built from."""
+    if instance.changed_on_save(*ArticleIndex.record_fields):
+        queue_index_update(Article, instance.pk)
+
+
+@receiver(post_delete, sender=Article)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def sync_record_on_change(sender, instance, **kwargs):
+    """Queue an Algolia sync of a saved or deleted object."""
+    queue_index_update(sender, instance.pk)
+
+
+# Author and category fields copied into the records of their articles
+ARTICLE_RECORD_RELATION_FIELDS = {
+    Author: ('full_name',),
+    Category: ('name', 'slug'),
+}
+
+
+@receiver(pre_save, sender=Author)
+@receiver(pre_save, sender=Category)
+def remember_article_record_fields(sender, instance, **kwargs):
+    if not instance._state.adding:
+        instance._article_record_values = (
+            sender.objects.filter(pk=instance.pk).values(*ARTICLE_RECORD_RELATION_FIELDS[sender]).first()
+        )
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Category)
+def sync_article_records_on_rename(sender, instance, created, **kwargs):
+    """Queue an Algolia sync of the articles whose records show a renamed author or category."""
+    previous = getattr(instance, '_article_record_values', None)
+    instance._article_record_values = None
+    if created or previous is None:
+        return
+    if all(getattr(instance, name) == value for name, value in previous.items()):
+        return
+    for article_id in instance.articles.values_list('pk', flat=True):
+        queue_index_update(Article, article_id)
+
+
+@receiver(pre_delete, sender=Author)
+@receiver(pre_delete, sender=Category)
+def sync_article_records_on_delete(sender, instance, **kwargs):
+    """Queue an Algolia sync of the articles that lose a deleted author or category."""
+    # The relation rows are deleted without m2m_changed signals
+    for article_id in instance.articles.values_list('pk', flat=True):
+        queue_index_update(Article, article_id)
+
+
+@receiver(m2m_changed, sender=Article.authors.through)
+@receiver(m2m_changed, sender=Article.categories.through)
+def sync_article_record_on_relation_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Queue an Algolia sync of the articles whose authors or categories changed."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        queue_index_update(Article, instance.pk)
+    else:
+        for article_id in pk_set or ():
+            queue_index_update(Article, article_id)
+
+
+@receiver(post_save, sender=Article)
+def update_article_typeahead_on_save(sender, instance, **kwargs):
+    """Refresh an article's typeahead suggestion when its title, slug or status changed."""
+    if instance.changed_on_save('title', 'slug', 'status'):
+        update_typeahead(instance)
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Category)
+def update_typeahead_on_save(sender, instance, **kwargs):
+    """Refresh the typeahead suggestion of a saved author or category."""
+    update_typeahead(instance)
+
+
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Category)
+def update_typeahead_on_delete(sender, instance, **kwargs):
+    """Drop a deleted object's typeahead suggestion."""
+    update_typeahead(instance, deleted=True)
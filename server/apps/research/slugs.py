@@ -0,0 +1,47 @@
+import logging
+import re
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+SLUG_SAVE_ATTEMPTS = 3
+
+
+def next_free_slug(queryset, base_slug, reserved=()):
+    """
+    Return ``base_slug``, or ``base_slug-N`` with the smallest free N, using a
+    single query for the slugs in ``queryset`` that could collide. Slugs in
+    ``reserved`` are never returned.
+    """
+    taken = set(
+        queryset.filter(Q(slug=base_slug) | Q(slug__regex=rf'^{re.escape(base_slug)}-[0-9]+$'))
+        .values_list('slug', flat=True)
+    )
+    taken.update(slug for slug in reserved if slug == base_slug)
+    if base_slug not in taken:
+        return base_slug
+
+    prefix = f'{base_slug}-'
+    suffixes = {int(slug[len(prefix):]) for slug in taken if slug != base_slug}
+    num = 1
+    while num in suffixes:
+        num += 1
+    return f'{prefix}{num}'
+
+
+def save_with_free_slug(instance, save, allocate_slug):
+    """
+    Run ``save`` in a savepoint. If a concurrent save took the instance's slug
+    first, allocate another one and try again.
+    """
+    for attempt in range(1, SLUG_SAVE_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            slug_taken = type(instance)._default_manager.filter(slug=instance.slug).exclude(pk=instance.pk).exists()
+            if not slug_taken or attempt == SLUG_SAVE_ATTEMPTS:
+                raise
+            logger.warning(f"Slug '{instance.slug}' was taken concurrently, allocating another (attempt {attempt})")
+            instance.slug = allocate_slug()
@@ -1,11 +1,106 @@
 from celery import shared_task
+from django.db import transaction
+from django.db.models import Case, Count, F, Min, Q, Value, When
 from django.utils import timezone
-from .models import Article
+from .models import Article, ArticleRecommendation, Category
+from .models.article import RELATED_ARTICLES_COUNT
+from .cache import invalidate_research_cache
+from .services.view_counter import get_view_counter
+from .indexing import queue_index_update, sync_record
+from .typeahead import update_typeahead
+
+VIEW_FLUSH_BATCH_SIZE = 500
 
 # TODO: Implement Querying the Articles in chunks in case of very large dataset
 @shared_task
 def publish_scheduled_articles():
     """Publish articles that are scheduled to be published."""
     now = timezone.now()
-    articles_to_publish = Article.objects.filter(status='draft', scheduled_publish_time__lte=now)
-    articles_to_publish.update(status='ready')
\ No newline at end of file
+    article_ids = list(
+        Article.objects.filter(status='draft', scheduled_publish_time__lte=now).values_list('id', flat=True)
+    )
+    if not article_ids:
+        return
+    Article.objects.filter(pk__in=article_ids).update(status='ready')
+    Category.refresh_article_counts(
+        Category.objects.filter(articles__in=article_ids).values('pk')
+    )
+
+    # Bulk updates bypass the save signals, so refresh derived data here
+    invalidate_research_cache()
+    refresh_related_articles.delay([str(article_id) for article_id in article_ids])
+    for article_id in article_ids:
+        queue_index_update(Article, article_id)
+    for article in Article.objects.filter(pk__in=article_ids).only('id', 'title', 'slug', 'status', 'views'):
+        update_typeahead(article)
+
+@shared_task
+def refresh_related_articles(article_ids):
+    """
+    Recompute the stored related articles of the given articles and of every
+    article whose recommendations they may appear in.
+    """
+    affected_ids = set(article_ids)
+    affected_ids.update(
+        ArticleRecommendation.objects.filter(recommended_id__in=article_ids).values_list('article_id', flat=True)
+    )
+    affected_ids.update(
+        Article.objects.filter(related_articles__in=article_ids).values_list('id', flat=True)
+    )
+    for article in Article.objects.filter(pk__in=article_ids, status='ready').only('id', 'scheduled_publish_time'):
+        affected_ids.update(_recommendations_reachable_by(article))
+
+    changed = False
+    for article in Article.objects.filter(pk__in=affected_ids):
+        changed = article.refresh_recommendations() or changed
+    # This runs after the saves that queued it invalidated the cache, so responses
+    # cached in between hold the old related articles
+    if changed:
+        invalidate_research_cache()
+
+def _recommendations_reachable_by(article):
+    """
+    Return the ids of the articles whose automatic recommendations ``article``
+    can now enter: articles sharing a category, without manual picks, whose
+    list is not full or holds an article published no later than this one.
+    """
+    candidates = Article.objects.filter(
+        categories__in=article.categories.values('pk')
+    ).exclude(pk=article.pk).annotate(
+        manual_count=Count('related_articles', filter=Q(related_articles__status='ready'), distinct=True),
+        recommendation_count=Count('recommendations', distinct=True),
+        oldest_recommended=Min('recommendations__recommended__scheduled_publish_time'),
+    ).filter(manual_count=0)
+    # Where an article without a publish time sorts depends on the database, so it may enter any list
+    if article.scheduled_publish_time is not None:
+        candidates = candidates.filter(
+            Q(recommendation_count__lt=RELATED_ARTICLES_COUNT)
+            | Q(oldest_recommended__lte=article.scheduled_publish_time)
+            | Q(oldest_recommended__isnull=True)
+        )
+    return candidates.values_list('id', flat=True).distinct()
+
+@shared_task
+def flush_article_views():
+    """Write buffered article views to the database in batched updates."""
+    counter = get_view_counter()
+    pending = list(counter.take_pending().items())
+    if not pending:
+        return 0
+
+    with transaction.atomic():
+        for start in range(0, len(pending), VIEW_FLUSH_BATCH_SIZE):
+            batch = pending[start:start + VIEW_FLUSH_BATCH_SIZE]
+            Article.objects.filter(pk__in=[article_id for article_id, _ in batch]).update(
+                views=F('views') + Case(
+                    *[When(pk=article_id, then=Value(count)) for article_id, count in batch],
+                    default=Value(0),
+                )
+            )
+    counter.ack()
+    return len(pending)
+
+@shared_task
+def sync_index_record(model_label, object_id):
+    """Bring an object's Algolia record up to date, skipping unchanged records."""
+    return sync_record(model_label, object_id)
@@ -1,9 +1,32 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+from unittest.mock import ANY, patch
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from django.utils.text import slugify
-from .models import Article
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from .models import Article, Author, Category, IndexedRecord
+from .services import view_counter
+from .services.gpt_service import GPTService
+from .tasks import flush_article_views, publish_scheduled_articles, refresh_related_articles, _recommendations_reachable_by
+from .cache import get_cache_generation, resolve_article_identifier
+from .typeahead import TypeaheadIndex, typeahead_index, TYPEAHEAD_CHANGE_KEY, TYPEAHEAD_SYNC_INTERVAL
+from .serializers import ArticleSerializer, ArticleListSerializer, AuthorSerializer, deferred_fields, drf_representation
+from .serializers import fast
+from .renderers import ORJSONRenderer
+from rest_framework.renderers import JSONRenderer
+from django.db import connection, IntegrityError
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from io import StringIO
 from datetime import datetime, timedelta
 from django.utils import timezone
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from algoliasearch_django import algolia_engine
 
 class ArticleModelTest(TestCase):
     def setUp(self):
@@ -98,3 +121,1260 @@ class ArticleModelTest(TestCase):
         article.save()
         article.refresh_from_db()
         self.assertEqual(article.views, 1)
+
+
+class ArticleDetailCacheTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='cacheuser', password='12345')
+        self.author = Author.objects.create(user=self.user, full_name='Cache User')
+        self.category = Category.objects.create(name='Layer 2')
+        self.article = Article.objects.create(
+            title='Cached Article',
+            content='<h2>Intro</h2><p>Cached content.</p>',
+            status='ready'
+        )
+        self.article.authors.set([self.author])
+        self.article.categories.set([self.category])
+        cache.clear()
+        view_counter._counter = None
+
+    def test_detail_is_served_from_cache(self):
+        url = f'/api/articles/{self.article.slug}/'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(second.data['title'], 'Cached Article')
+        self.assertEqual(second.data['views'], 2)
+
+    def test_uuid_and_slug_share_cached_payload(self):
+        self.client.get(f'/api/articles/{self.article.slug}/')
+        # Only the UUID itself still has to be resolved
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/articles/{self.article.id}/')
+        self.assertEqual(response.data['slug'], self.article.slug)
+
+    def test_article_save_invalidates_cache(self):
+        url = f'/api/articles/{self.article.id}/'
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.summary = 'Updated summary'
+            self.article.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data['summary'], 'Updated summary')
+
+    def test_category_change_invalidates_cache(self):
+        url = f'/api/articles/{self.article.id}/'
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Rollups'
+            self.category.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data['categories'][0]['name'], 'Rollups')
+
+
+class ArticleViewCounterTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.article = Article.objects.create(title='Counted Article', content='<p>Body</p>', status='ready')
+        cache.clear()
+        view_counter._counter = None
+
+    def test_views_are_buffered_until_flushed(self):
+        for expected in (1, 2, 3):
+            response = self.client.get(f'/api/articles/{self.article.slug}/')
+            self.assertEqual(response.data['views'], expected)
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views, 0)
+
+        self.assertEqual(flush_article_views(), 1)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views, 3)
+
+    def test_flush_keeps_running_total(self):
+        self.client.get(f'/api/articles/{self.article.slug}/')
+        flush_article_views()
+        response = self.client.get(f'/api/articles/{self.article.slug}/')
+        self.assertEqual(response.data['views'], 2)
+        self.assertEqual(flush_article_views(), 1)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views, 2)
+
+    @override_settings(ARTICLE_VIEW_COUNTER_URL='')
+    def test_views_are_written_directly_without_a_shared_buffer(self):
+        # A per-process buffer would lose views counted by web processes the flush task never sees
+        view_counter._counter = None
+        self.addCleanup(setattr, view_counter, '_counter', None)
+        self.assertIsInstance(view_counter.get_view_counter(), view_counter.DirectViewCounter)
+        self.client.get(f'/api/articles/{self.article.slug}/')
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views, 1)
+        self.assertEqual(flush_article_views(), 0)
+
+    def test_redis_running_totals_expire(self):
+        with patch('redis.Redis.from_url'):
+            client = view_counter.RedisViewCounter('redis://localhost:6379/0')
+        pipe = client.client.pipeline.return_value
+        pipe.execute.return_value = [True, 4, True, 1]
+        self.assertEqual(client.record_view(self.article.pk, 3), 4)
+        total_key = view_counter.TOTAL_KEY.format(article_id=self.article.pk)
+        pipe.set.assert_called_once_with(total_key, 3, nx=True, ex=view_counter.TOTAL_TIMEOUT)
+        pipe.expire.assert_called_once_with(total_key, view_counter.TOTAL_TIMEOUT)
+
+
+class ArticleIdentifierResolutionTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        view_counter._counter = None
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article = Article.objects.create(title='Original Title', content='<p>Body</p>', status='ready')
+
+    def test_identifiers_are_indexed_on_save(self):
+        entry = {'id': str(self.article.id), 'slug': 'original-title'}
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_article_identifier('original-title'), entry)
+            self.assertEqual(resolve_article_identifier(str(self.article.id).upper()), entry)
+
+    def test_old_slug_redirects_to_canonical_slug(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.title = 'Renamed Title'
+            self.article.save()
+
+        self.assertEqual(resolve_article_identifier('original-title')['slug'], 'renamed-title')
+        response = self.client.get('/api/articles/original-title/')
+        self.assertEqual(response.status_code, 301)
+        self.assertTrue(response.data['new_url'].endswith('/api/articles/renamed-title/'))
+        self.assertEqual(response.data['data']['slug'], 'renamed-title')
+
+    def test_old_slug_taken_by_another_article_is_not_overwritten(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.title = 'Renamed Title'
+            self.article.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            other = Article.objects.create(title='Original Title', content='<p>Other</p>', status='ready')
+        self.assertEqual(other.slug, 'original-title')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.title = 'Third Title'
+            self.article.save()
+        self.assertEqual(resolve_article_identifier('original-title'), {'id': str(other.id), 'slug': 'original-title'})
+        self.assertEqual(self.client.get('/api/articles/original-title/').status_code, 200)
+        self.assertEqual(resolve_article_identifier('renamed-title')['slug'], 'third-title')
+
+    def test_missing_slug_is_cached(self):
+        response = self.client.get('/api/articles/does-not-exist/')
+        self.assertEqual(response.status_code, 404)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/articles/does-not-exist/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_new_article_replaces_cached_miss(self):
+        self.client.get('/api/articles/fresh-article/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(title='Fresh Article', content='<p>New</p>', status='ready')
+        response = self.client.get('/api/articles/fresh-article/')
+        self.assertEqual(response.status_code, 200)
+
+
+class ArticleRecommendationTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='DeFi')
+        self.now = timezone.now()
+        self.articles = [self.create_article(f'DeFi Article {i}', days_ago=i) for i in range(4)]
+
+    def create_article(self, title, days_ago=0, status='ready'):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = Article.objects.create(
+                title=title,
+                content='<p>Body</p>',
+                status=status,
+                scheduled_publish_time=self.now - timedelta(days=days_ago)
+            )
+            article.categories.set([self.category])
+        return article
+
+    def test_recommendations_fall_back_to_shared_categories(self):
+        newest, *older = self.articles
+        related = list(older[-1].get_related_articles())
+        self.assertEqual(related, self.articles[:3])
+        self.assertNotIn(newest, newest.get_related_articles())
+
+    def test_manual_picks_take_precedence(self):
+        article = self.articles[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            article.related_articles.set([self.articles[3]])
+        self.assertEqual(list(article.get_related_articles()), [self.articles[3]])
+
+    def test_publishing_refreshes_other_articles(self):
+        draft = self.create_article('Fresh DeFi Article', days_ago=-1, status='draft')
+        self.assertNotIn(draft, self.articles[3].get_related_articles())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.status = 'ready'
+            draft.save()
+        self.assertEqual(self.articles[3].get_related_articles().first(), draft)
+
+    def test_changed_recommendations_invalidate_the_cache(self):
+        generation = get_cache_generation()
+        refresh_related_articles([str(self.articles[0].pk)])
+        self.assertEqual(get_cache_generation(), generation)
+
+        with patch('apps.research.signals.refresh_related_articles'):
+            with self.captureOnCommitCallbacks(execute=True):
+                fresh = self.create_article('Fresh DeFi Article', days_ago=-1)
+        generation = get_cache_generation()
+        refresh_related_articles([str(fresh.pk)])
+        self.assertGreater(get_cache_generation(), generation)
+        self.assertEqual(self.articles[0].get_related_articles().first(), fresh)
+
+    def test_publishing_only_refreshes_lists_it_can_enter(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.articles[0].related_articles.set([self.articles[1]])
+        old = self.create_article('Old DeFi Article', days_ago=30)
+        reached = set(_recommendations_reachable_by(old))
+        # Every list without manual picks is already full of newer articles
+        self.assertEqual(reached, set())
+
+        fresh = self.create_article('Fresh DeFi Article', days_ago=-1)
+        self.assertEqual(
+            set(_recommendations_reachable_by(fresh)),
+            {article.pk for article in self.articles[1:]} | {old.pk}
+        )
+
+    def test_related_articles_are_read_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(len(list(self.articles[0].get_related_articles())), 3)
+
+
+class SerializerQueryCountTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Privacy')
+        self.now = timezone.now()
+        self.authors = [
+            Author.objects.create(user=User.objects.create_user(username=f'writer{i}'), full_name=f'Writer {i}')
+            for i in range(3)
+        ]
+
+    def create_article(self, title, authors, days_ago=0):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = Article.objects.create(
+                title=title,
+                content='<p>Body</p>',
+                status='ready',
+                scheduled_publish_time=self.now - timedelta(days=days_ago)
+            )
+            article.authors.set(authors)
+            article.categories.set([self.category])
+        return article
+
+    def count_detail_queries(self, article):
+        with CaptureQueriesContext(connection) as queries:
+            data = ArticleSerializer(Article.objects.get(pk=article.pk)).data
+        return len(queries), data
+
+    def test_detail_query_count_is_constant(self):
+        first = self.create_article('Lonely Article', self.authors[:1])
+        small_count, small_data = self.count_detail_queries(first)
+        self.assertEqual(small_data['related_articles'], [])
+
+        for i in range(3):
+            self.create_article(f'Neighbour {i}', self.authors, days_ago=i + 1)
+        large_count, large_data = self.count_detail_queries(first)
+        self.assertEqual(len(large_data['related_articles']), 3)
+        self.assertEqual(
+            {author['username'] for author in large_data['related_articles'][0]['authors']},
+            {'writer0', 'writer1', 'writer2'}
+        )
+        self.assertEqual(small_count, large_count)
+
+    def test_list_query_count_is_constant(self):
+        for i in range(5):
+            self.create_article(f'Listed {i}', self.authors, days_ago=i)
+        with self.assertNumQueries(4):
+            data = ArticleListSerializer(Article.objects.all(), many=True).data
+        self.assertEqual(len(data), 5)
+        with self.assertNumQueries(2):
+            AuthorSerializer(Author.objects.all(), many=True).data
+
+
+class ReadingTimeTest(TestCase):
+    def test_reading_time_is_stored_from_text(self):
+        content = '<p>' + '<b>word</b> ' * 900 + '</p>'
+        article = Article.objects.create(title='Long Read', content=content, status='ready')
+        self.assertEqual(article.word_count, 900)
+        self.assertEqual(article.min_read, 3)
+
+        article.content = ''
+        article.save()
+        self.assertEqual((article.word_count, article.min_read), (0, 1))
+
+    def test_backfill_command(self):
+        article = Article.objects.create(title='Backfilled', content='<p>one two three</p>')
+        Article.objects.filter(pk=article.pk).update(word_count=0, min_read=0)
+
+        call_command('backfill_reading_time', stdout=StringIO())
+        article.refresh_from_db()
+        self.assertEqual((article.word_count, article.min_read), (3, 1))
+
+    def test_list_payload_uses_stored_reading_time(self):
+        Article.objects.create(title='Listed Read', content='<p>Body</p>', status='ready')
+        response = APIClient().get('/api/articles/')
+        self.assertEqual(response.data['results'][0]['min_read'], 1)
+        self.assertNotIn('word_count', response.data['results'][0])
+
+
+class ListProjectionTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Layer 1', is_primary=True)
+        for i in range(3):
+            article = Article.objects.create(
+                title=f'Projected {i}',
+                content='<p>Heavy body</p>',
+                gpt_summary='<p>Heavy summary</p>',
+                status='ready'
+            )
+            article.categories.set([self.category])
+
+    def assert_content_not_selected(self, queries):
+        article_selects = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('SELECT') and 'FROM "research_article" ' in query['sql']
+        ]
+        self.assertTrue(article_selects)
+        for sql in article_selects:
+            self.assertNotIn('"research_article"."content"', sql)
+            self.assertNotIn('"research_article"."gpt_summary"', sql)
+
+    def test_deferred_fields_follow_serializer(self):
+        self.assertIn('content', deferred_fields(ArticleListSerializer))
+        self.assertNotIn('title', deferred_fields(ArticleListSerializer))
+        # The stored delivery URL is rendered in place of the raw Cloudinary field
+        self.assertNotIn('thumb_url', deferred_fields(ArticleListSerializer))
+        self.assertIn('thumb', deferred_fields(ArticleListSerializer))
+        self.assertNotIn('content', deferred_fields(ArticleSerializer))
+
+    def test_list_does_not_load_content(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/articles/')
+        self.assertEqual(len(response.data['results']), 3)
+        self.assert_content_not_selected(queries)
+
+    def test_categories_only_loads_content_for_latest_article(self):
+        response = self.client.get('/api/categories/')
+        category_data = response.data['data'][0]
+        self.assertEqual(len(category_data['articles']), 3)
+        self.assertNotIn('content', category_data['articles'][0])
+        self.assertEqual(category_data['latest_article']['content'], '<p>Heavy body</p>')
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Interoperability', is_primary=True)
+        now = timezone.now()
+        publish_times = [now - timedelta(days=1)] * 3 + [now - timedelta(days=2), None]
+        self.articles = []
+        for i, published in enumerate(publish_times):
+            article = Article.objects.create(
+                title=f'Paged {i}', content='<p>Body</p>', status='ready', scheduled_publish_time=published
+            )
+            article.categories.set([self.category])
+            self.articles.append(article)
+
+    def walk(self, url):
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        return seen
+
+    def test_cursor_pages_cover_every_article_once(self):
+        seen = self.walk('/api/articles/?pagination=cursor&page_size=2')
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(set(seen), {str(article.id) for article in self.articles})
+        self.assertEqual(seen[-1], str(self.articles[-1].id))
+
+    def test_cursor_pages_for_primary_category(self):
+        seen = self.walk(f'/api/articles/primary-category/{self.category.slug}/?pagination=cursor&page_size=2')
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_page_number_mode_is_default(self):
+        response = self.client.get('/api/articles/?page_size=2')
+        self.assertEqual(response.data['count'], 5)
+
+    def test_both_modes_share_one_order(self):
+        pages = []
+        url = '/api/articles/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            pages.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(pages, self.walk('/api/articles/?pagination=cursor&page_size=2'))
+        self.assertEqual(pages[-1], str(self.articles[-1].id))
+
+    def test_cursor_seeks_into_the_unscheduled_tail(self):
+        with CaptureQueriesContext(connection) as queries:
+            seen = self.walk('/api/articles/?pagination=cursor&page_size=3')
+        self.assertEqual(len(seen), 5)
+        # Only the second page reaches past the scheduled articles
+        self.assertEqual(sum('IS NULL' in query['sql'] for query in queries.captured_queries), 1)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/articles/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+
+class ConditionalRequestTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Restaking', is_primary=True)
+        self.article = Article.objects.create(
+            title='Conditional Article', content='<p>Body</p>', status='ready'
+        )
+        self.article.categories.set([self.category])
+        cache.clear()
+        view_counter._counter = None
+
+    def assertRevalidates(self, url):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.has_header('ETag'))
+        self.assertTrue(first.has_header('Last-Modified'))
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b'')
+        return first['ETag']
+
+    def test_detail_not_modified(self):
+        self.assertRevalidates(f'/api/articles/{self.article.slug}/')
+
+    def test_detail_not_modified_still_counts_view(self):
+        url = f'/api/articles/{self.article.slug}/'
+        etag = self.client.get(url)['ETag']
+        self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(self.client.get(url).data['views'], 3)
+
+    def test_collections_not_modified(self):
+        self.assertRevalidates('/api/articles/')
+        self.assertRevalidates(f'/api/articles/category/{self.category.slug}/')
+        self.assertRevalidates(f'/api/articles/primary-category/{self.category.slug}/')
+        self.assertRevalidates('/api/categories/')
+        self.assertRevalidates('/research/rss/')
+
+    def test_edit_changes_etag(self):
+        url = f'/api/articles/{self.article.slug}/'
+        etag = self.assertRevalidates(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.summary = 'Edited'
+            self.article.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['summary'], 'Edited')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_collection_validators_do_not_query(self):
+        etag = self.client.get('/api/articles/?page=1')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/articles/?page=1', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # Other pages have their own validators
+        self.assertNotEqual(self.client.get('/api/articles/?page_size=5')['ETag'], etag)
+
+    def test_category_rename_changes_list_etag(self):
+        etag = self.assertRevalidates('/api/articles/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Shared Security'
+            self.category.save()
+        response = self.client.get('/api/articles/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class CategoryTopArticlesTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.primary = Category.objects.create(name='Rollups', is_primary=True)
+        self.other = Category.objects.create(name='Bridges')
+        self.articles = []
+        for i in range(4):
+            article = Article.objects.create(title=f'Rollup {i}', content='<p>Body</p>', status='ready')
+            article.categories.set([self.primary, self.other] if i % 2 else [self.primary])
+            self.articles.append(article)
+        draft = Article.objects.create(
+            title='Draft', content='<p>Body</p>', status='draft',
+            scheduled_publish_time=timezone.now() + timedelta(days=1)
+        )
+        draft.categories.set([self.primary])
+
+    def test_articles_are_limited_in_the_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/categories/?articles_page_size=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('ROW_NUMBER' in query['sql'].upper() for query in queries.captured_queries))
+
+        data = {category['name']: category for category in response.data['data']}
+        rollups = data['Rollups']
+        self.assertEqual(rollups['total_articles'], 4)
+        self.assertEqual(
+            [article['title'] for article in rollups['articles']], ['Rollup 3', 'Rollup 2']
+        )
+        self.assertEqual(rollups['latest_article']['title'], 'Rollup 3')
+        self.assertEqual(data['Bridges']['total_articles'], 2)
+        self.assertEqual(len(data['Bridges']['articles']), 2)
+        self.assertIsNone(data['Bridges']['latest_article'])
+
+
+class CategoryArticleCountTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Zero Knowledge')
+        self.other = Category.objects.create(name='MEV')
+        self.article = Article.objects.create(title='ZK Rollups', content='<p>Body</p>', status='ready')
+
+    def assertCounts(self, category_count, other_count):
+        self.category.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.category.article_count, self.other.article_count), (category_count, other_count))
+
+    def test_relation_changes_update_counts(self):
+        self.article.categories.add(self.category, self.other)
+        self.assertCounts(1, 1)
+        self.article.categories.remove(self.other)
+        self.assertCounts(1, 0)
+        self.other.articles.add(self.article)
+        self.assertCounts(1, 1)
+        self.article.categories.clear()
+        self.assertCounts(0, 0)
+
+    def test_status_changes_update_counts(self):
+        self.article.categories.add(self.category)
+        self.article.status = 'draft'
+        self.article.scheduled_publish_time = timezone.now() + timedelta(days=1)
+        self.article.save()
+        self.assertCounts(0, 0)
+        self.article.delete()
+        self.assertCounts(0, 0)
+
+    def test_scheduled_publish_updates_counts(self):
+        draft = Article.objects.create(
+            title='Scheduled', content='<p>Body</p>', status='draft',
+            scheduled_publish_time=timezone.now() + timedelta(days=1)
+        )
+        draft.categories.add(self.category)
+        self.assertCounts(0, 0)
+        Article.objects.filter(pk=draft.pk).update(scheduled_publish_time=timezone.now() - timedelta(minutes=1))
+        publish_scheduled_articles()
+        self.assertCounts(1, 0)
+
+    def test_reconcile_command(self):
+        self.article.categories.add(self.category)
+        Category.objects.filter(pk=self.category.pk).update(article_count=7)
+        out = StringIO()
+        call_command('reconcile_category_counts', stdout=out)
+        self.assertIn('stored 7, actual 1', out.getvalue())
+        self.assertCounts(1, 0)
+
+    def test_categories_sorted_by_stored_count(self):
+        self.article.categories.add(self.other)
+        response = APIClient().get('/api/categories/?sort_by=article_count')
+        self.assertEqual([category['name'] for category in response.data['data']], ['Zero Knowledge', 'MEV'])
+        self.assertEqual(response.data['data'][1]['total_articles'], 1)
+
+
+class CategoryArticlesEndpointTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Data Availability')
+        self.user = User.objects.create_user(username='dauser', password='12345')
+        self.author = Author.objects.create(user=self.user, full_name='DA User')
+        draft = Article.objects.create(
+            title='DA Draft', content='<p>Body</p>', status='draft',
+            scheduled_publish_time=timezone.now() + timedelta(days=1)
+        )
+        draft.categories.set([self.category])
+
+    def add_articles(self, count):
+        for i in range(count):
+            article = Article.objects.create(title=f'DA {i}', content='<p>Body</p>', status='ready')
+            article.categories.set([self.category])
+            article.authors.set([self.author])
+
+    def fetch(self, query=''):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/articles/category/{self.category.slug}/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_paginated_list_payload_without_drafts(self):
+        self.add_articles(3)
+        response, _ = self.fetch('?page_size=2')
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+        self.assertNotIn('content', response.data['results'][0])
+        self.assertNotIn('DA Draft', [article['title'] for article in response.data['results']])
+
+    def test_query_count_does_not_grow_with_results(self):
+        self.add_articles(2)
+        _, few = self.fetch()
+        self.add_articles(4)
+        _, many = self.fetch()
+        self.assertEqual(few, many)
+
+
+class AuthorArticlesEndpointTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='prolific', password='12345')
+        self.author = Author.objects.create(user=self.user, full_name='Prolific Author')
+        self.category = Category.objects.create(name='Staking')
+        draft = Article.objects.create(
+            title='Unpublished', content='<p>Body</p>', status='draft',
+            scheduled_publish_time=timezone.now() + timedelta(days=1)
+        )
+        draft.authors.set([self.author])
+
+    def add_articles(self, count):
+        for i in range(count):
+            article = Article.objects.create(title=f'Staking {i}', content='<p>Body</p>', status='ready')
+            article.authors.set([self.author])
+            article.categories.set([self.category])
+
+    def fetch(self, query=''):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/authors/{self.author.id}/articles/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_paginated_list_payload_without_drafts(self):
+        self.add_articles(3)
+        response, _ = self.fetch('?page_size=2')
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertNotIn('content', response.data['results'][0])
+        self.assertNotIn('related_articles', response.data['results'][0])
+
+    def test_query_count_does_not_grow_with_results(self):
+        self.add_articles(2)
+        _, few = self.fetch()
+        self.add_articles(4)
+        _, many = self.fetch()
+        self.assertEqual(few, many)
+
+
+class FastSerializationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='fastuser', password='12345')
+        self.author = Author.objects.create(user=self.user, full_name='Fäst Writer', bio='Line\u2028separated')
+        self.category = Category.objects.create(name='Ünïcode')
+        self.articles = []
+        for i in range(3):
+            article = Article.objects.create(
+                title=f'Fast “{i}”', summary='Tabs\tand\u2029paragraphs', content='<h2>Intro</h2><p>Body</p>',
+                status='ready'
+            )
+            article.authors.set([self.author])
+            article.categories.set([self.category])
+            self.articles.append(article)
+        for article in self.articles:
+            article.refresh_recommendations()
+        cache.clear()
+        view_counter._counter = None
+
+    def reference(self, serializer_class, instance, many):
+        with drf_representation():
+            return JSONRenderer().render(serializer_class(instance, many=many, context={}).data)
+
+    def test_list_matches_drf_bytes(self):
+        articles = Article.objects.filter(pk__in=[article.pk for article in self.articles])
+        self.assertEqual(
+            ORJSONRenderer().render(ArticleListSerializer(articles, many=True, context={}).data),
+            self.reference(ArticleListSerializer, articles, True)
+        )
+
+    def test_detail_matches_drf_bytes(self):
+        article = Article.objects.get(pk=self.articles[0].pk)
+        rendered = ORJSONRenderer().render(ArticleSerializer(article, context={}).data)
+        self.assertEqual(rendered, self.reference(ArticleSerializer, Article.objects.get(pk=article.pk), False))
+        self.assertIn(b'\\u2029', rendered)
+
+    def test_nested_authors_load_their_users_in_one_query(self):
+        second = Author.objects.create(user=User.objects.create_user(username='second', password='12345'))
+        self.articles[0].authors.add(second)
+        article = Article.objects.prefetch_related('authors', 'categories').get(pk=self.articles[0].pk)
+        with self.assertNumQueries(1):
+            data = ArticleListSerializer(article, context={}).data
+        self.assertEqual({author['username'] for author in data['authors']}, {'fastuser', 'second'})
+
+    def test_drf_representation_is_local_to_its_context(self):
+        seen = []
+        with drf_representation():
+            thread = threading.Thread(target=lambda: seen.append(fast._use_fast_path.get()))
+            thread.start()
+            thread.join()
+            self.assertFalse(fast._use_fast_path.get())
+        self.assertEqual(seen, [True])
+        self.assertTrue(fast._use_fast_path.get())
+
+    def test_endpoint_uses_orjson_renderer(self):
+        response = self.client.get('/api/articles/')
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+
+class ThumbnailUrlTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.article = Article.objects.create(
+            title='Thumbnail Article', content='<p>Body</p>', status='ready', thumb='coverImage/cover_abc'
+        )
+        cache.clear()
+        view_counter._counter = None
+
+    def test_urls_are_stored_on_save(self):
+        domain = settings.CLOUDINARY_DOMAIN
+        self.assertEqual(self.article.thumb_url, f'{domain}/f_auto,q_auto,c_scale,h_810/coverImage/cover_abc')
+        self.assertEqual(
+            self.article.thumb_srcset.split(', ')[0],
+            f'{domain}/f_auto,q_auto,c_scale,w_400/coverImage/cover_abc 400w'
+        )
+
+        self.article.thumb = 'coverImage/cover_xyz'
+        self.article.save()
+        self.article.refresh_from_db()
+        self.assertTrue(self.article.thumb_url.endswith('/coverImage/cover_xyz'))
+        self.assertIn('cover_xyz 1200w', self.article.thumb_srcset)
+
+    def test_payloads_expose_stored_urls(self):
+        detail = self.client.get(f'/api/articles/{self.article.slug}/').data
+        self.assertEqual(detail['thumb'], self.article.thumb_url)
+        self.assertEqual(detail['thumb_srcset'], self.article.thumb_srcset)
+
+        listed = self.client.get('/api/articles/').data['results'][0]
+        self.assertEqual(listed['thumb'], self.article.thumb_url)
+        self.assertEqual(listed['thumb_srcset'], self.article.thumb_srcset)
+        self.assertNotIn('thumb_url', listed)
+
+
+class TableOfContentsTest(TestCase):
+    def setUp(self):
+        self.article = Article.objects.create(
+            title='TOC Article',
+            content='<h1>Intro</h1><p>a &amp; b</p><h2>Setup <em>steps</em></h2><h1>End</h1>',
+            status='ready'
+        )
+
+    def test_toc_and_anchors(self):
+        self.assertEqual(self.article.table_of_contents, [
+            {'title': 'Intro', 'id': 'intro', 'children': [
+                {'title': 'Setup steps', 'id': 'setup-steps', 'children': []},
+            ]},
+            {'title': 'End', 'id': 'end', 'children': []},
+        ])
+        self.assertIn('<h2 id="setup-steps">Setup <em>steps</em></h2>', self.article.content)
+        self.assertIn('<p>a &amp; b</p>', self.article.content)
+        self.assertFalse(self.article.content.startswith('<div>'))
+
+    def test_only_heading_ids_are_touched(self):
+        # The parser would move the heading out of the paragraph and add a tbody
+        content = '<p><h2 class="lead" ID=old>Nested Heading</h2></p><table><td>cell</td></table><H3>Upper</H3><br>'
+        self.article.content = content
+        self.article.save()
+        self.assertEqual(
+            self.article.content,
+            '<p><h2 class="lead" id="nested-heading">Nested Heading</h2></p><table><td>cell</td></table>'
+            '<H3 id="upper">Upper</H3><br>'
+        )
+
+    def test_unmatched_heading_tags_are_left_alone(self):
+        content = '<!-- <h1>Draft</h1> --><h2>Section</h2>'
+        self.article.content = content
+        self.article.save()
+        self.assertEqual(self.article.content, content)
+        self.assertEqual(self.article.table_of_contents, [{'title': 'Section', 'id': 'section', 'children': []}])
+
+    def test_content_is_kept_when_headings_are_anchored(self):
+        content = '<h2 id="kept">Kept</h2><p><b>unclosed</p>'
+        self.article.content = content
+        self.article.save()
+        self.assertEqual(self.article.content, content)
+
+    def test_rebuilt_only_when_content_changes(self):
+        with patch.object(Article, 'build_table_of_contents') as build:
+            self.article.status = 'draft'
+            self.article.scheduled_publish_time = timezone.now() + timedelta(days=1)
+            self.article.save()
+            Article.objects.defer('content').get(pk=self.article.pk).save()
+            build.assert_not_called()
+
+        self.article.content = '<h2>Replaced</h2>'
+        self.article.save()
+        self.assertEqual(self.article.table_of_contents, [{'title': 'Replaced', 'id': 'replaced', 'children': []}])
+
+    def test_deferred_content_is_not_loaded_on_save(self):
+        article = Article.objects.defer('content').get(pk=self.article.pk)
+        article.save()
+        self.assertIn('content', article.get_deferred_fields())
+
+
+class ArticleChangeTrackingTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Oracles')
+        article = Article.objects.create(title='Tracked Article', content='<h2>Intro</h2>', status='ready')
+        article.categories.set([self.category])
+        article.save()
+        self.article = Article.objects.get(pk=article.pk)
+
+    def test_unrelated_edit_skips_pre_save_reads(self):
+        self.article.summary = 'Only the summary changed'
+        with CaptureQueriesContext(connection) as queries:
+            self.article.save()
+        statements = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual([sql.split()[0] for sql in statements], ['UPDATE'])
+        self.assertEqual(self.article.slug, 'tracked-article')
+
+    def test_title_change_records_slug_history(self):
+        self.article.title = 'Renamed Article'
+        self.article.save()
+        self.assertEqual(self.article.slug, 'renamed-article')
+        self.assertEqual(
+            list(self.article.slug_history.values_list('old_slug', flat=True)), ['tracked-article']
+        )
+
+        # A second save of the same instance compares against the saved values
+        self.article.summary = 'Edited again'
+        self.article.save()
+        self.assertEqual(self.article.slug_history.count(), 1)
+
+    def test_deferred_field_assignment_counts_as_change(self):
+        article = Article.objects.defer('content').get(pk=self.article.pk)
+        self.assertFalse(article.field_changed('content'))
+        article.content = '<h2>New section</h2>'
+        self.assertTrue(article.field_changed('content'))
+        article.save()
+        self.assertEqual(article.table_of_contents[0]['id'], 'new-section')
+
+    def test_status_change_is_signalled(self):
+        self.article.status = 'draft'
+        self.article.scheduled_publish_time = timezone.now() + timedelta(days=1)
+        self.article.save()
+        self.assertTrue(self.article.changed_on_save('status'))
+        self.assertFalse(self.article.changed_on_save('title'))
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.article_count, 0)
+
+
+class SlugAllocationTest(TestCase):
+    def test_next_suffix_in_one_query(self):
+        for _ in range(3):
+            Article.objects.create(title='EIPs for Nerds', content='<p>Body</p>', status='ready')
+        Article.objects.create(title='EIPs for Nerds 2024', content='<p>Body</p>', status='ready')
+        article = Article(title='EIPs for Nerds', content='<p>Body</p>')
+        with self.assertNumQueries(1):
+            self.assertEqual(article.generate_unique_slug(), 'eips-for-nerds-3')
+
+    def test_smallest_free_suffix_is_reused(self):
+        slugs = [Category.objects.create(name='Rollups').slug for _ in range(3)]
+        self.assertEqual(slugs, ['rollups', 'rollups-1', 'rollups-2'])
+        Category.objects.get(slug='rollups-1').delete()
+        self.assertEqual(Category.objects.create(name='Rollups').slug, 'rollups-1')
+
+    def test_concurrently_taken_slug_is_retried(self):
+        Category.objects.create(name='Bridges')
+        category = Category(name='Bridges')
+        # The first allocation simulates a slug another save claimed in the meantime
+        with patch.object(Category, 'generate_slug', side_effect=['bridges', 'bridges-1']):
+            category.save()
+        self.assertEqual(category.slug, 'bridges-1')
+
+    def test_manual_duplicate_slug_is_rejected(self):
+        Category.objects.create(name='Bridges')
+        with self.assertRaises(IntegrityError):
+            Category.objects.create(name='Other', slug='bridges')
+
+
+class CategoryTreeTest(TestCase):
+    def setUp(self):
+        self.root = Category.objects.create(name='Scaling')
+        self.child = Category.objects.create(name='Rollups', parent=self.root)
+        self.grandchild = Category.objects.create(name='ZK Rollups', parent=self.child)
+        self.other = Category.objects.create(name='Governance')
+
+    def test_paths(self):
+        self.assertEqual(self.grandchild.path, f'/{self.root.pk.hex}/{self.child.pk.hex}/{self.grandchild.pk.hex}/')
+        with self.assertNumQueries(1):
+            self.assertEqual(set(self.grandchild.get_ancestors()), {self.root, self.child})
+        with self.assertNumQueries(1):
+            self.assertEqual(set(self.root.get_descendants()), {self.child, self.grandchild})
+
+    def test_moving_a_category_moves_its_subtree(self):
+        self.child.parent = self.other
+        self.child.save()
+        self.grandchild.refresh_from_db()
+        self.assertTrue(self.grandchild.path.startswith(self.other.path))
+        self.assertEqual(set(self.other.get_descendants()), {self.child, self.grandchild})
+        self.assertFalse(self.root.get_descendants().exists())
+
+    def test_clean_detects_cycles(self):
+        self.root.parent = self.grandchild
+        with self.assertRaises(ValidationError):
+            self.root.clean()
+
+    def test_subtree_articles_endpoint(self):
+        in_root = Article.objects.create(title='Scaling overview', content='<p>Body</p>', status='ready')
+        in_root.categories.set([self.root])
+        in_both = Article.objects.create(title='ZK deep dive', content='<p>Body</p>', status='ready')
+        in_both.categories.set([self.grandchild, self.child])
+        draft = Article.objects.create(
+            title='Unreleased', content='<p>Body</p>', status='draft',
+            scheduled_publish_time=timezone.now() + timedelta(days=1)
+        )
+        draft.categories.set([self.grandchild])
+        elsewhere = Article.objects.create(title='DAOs', content='<p>Body</p>', status='ready')
+        elsewhere.categories.set([self.other])
+
+        response = APIClient().get(f'/api/articles/category-tree/{self.child.slug}/')
+        self.assertEqual([article['title'] for article in response.data['results']], ['ZK deep dive'])
+        response = APIClient().get(f'/api/articles/category-tree/{self.root.slug}/')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(APIClient().get('/api/articles/category-tree/missing/').status_code, 404)
+
+class SearchTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Scaling')
+        self.other_category = Category.objects.create(name='Governance')
+        self.author = Author.objects.create(
+            user=User.objects.create_user(username='searcher', password='password'), full_name='Search Author'
+        )
+        self.in_title = Article.objects.create(
+            title='Rollup economics', summary='Fees', content='<p>Sequencers and blobs</p>', status='ready'
+        )
+        self.in_title.categories.set([self.category])
+        self.in_title.authors.set([self.author])
+        self.in_content = Article.objects.create(
+            title='Data availability', summary='Blobs',
+            content='<h2>Intro</h2><p>Every rollup posts data</p><script>var rollup;</script>', status='ready'
+        )
+        self.in_content.categories.set([self.other_category])
+        Article.objects.create(title='Unrelated', content='<p>Staking</p>', status='ready')
+
+    def test_content_text_is_stored(self):
+        self.assertEqual(self.in_content.content_text, 'Intro Every rollup posts data')
+        self.in_content.content = '<p>Validators</p>'
+        self.in_content.save()
+        self.in_content.refresh_from_db()
+        self.assertEqual(self.in_content.content_text, 'Validators')
+
+    def test_results_are_ranked_with_facets(self):
+        response = APIClient().get('/api/articles/search/', {'q': 'rollup'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [article['title'] for article in response.data['results']], ['Rollup economics', 'Data availability']
+        )
+        self.assertEqual(
+            {(facet['slug'], facet['count']) for facet in response.data['facets']['categories']},
+            {(self.category.slug, 1), (self.other_category.slug, 1)}
+        )
+        self.assertEqual(response.data['facets']['authors'][0]['full_name'], 'Search Author')
+
+    def test_filters_and_edits(self):
+        response = APIClient().get('/api/articles/search/', {'q': 'rollup', 'category': self.other_category.slug})
+        self.assertEqual([article['title'] for article in response.data['results']], ['Data availability'])
+
+        self.in_content.title = 'Staking yields'
+        self.in_content.content = '<p>Validators</p>'
+        self.in_content.save()
+        response = APIClient().get('/api/articles/search/', {'q': 'rollup'})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(APIClient().get('/api/articles/search/').status_code, 400)
+
+    def test_invalid_filters_are_rejected(self):
+        self.assertEqual(APIClient().get('/api/articles/search/', {'q': 'rollup', 'author': 'abc'}).status_code, 400)
+        self.assertEqual(APIClient().get('/api/articles/search/', {'q': 'rollup', 'category': 'a b'}).status_code, 400)
+
+    def test_search_slug_is_reserved(self):
+        article = Article.objects.create(title='Search', content='<p>Rollup</p>', status='ready')
+        self.assertEqual(article.slug, 'search-1')
+        article.slug = 'search'
+        article.save()
+        self.assertEqual(article.slug, 'search-1')
+        response = APIClient().get(f'/api/articles/{article.slug}/')
+        self.assertEqual(response.data['title'], 'Search')
+
+class BulkReindexTest(TestCase):
+    def setUp(self):
+        self.adapter = algolia_engine.get_adapter(Article)
+        category = Category.objects.create(name='Scaling')
+        authors = [
+            Author.objects.create(user=User.objects.create_user(username=f'indexed-{i}'), full_name=f'Author {i}')
+            for i in range(2)
+        ]
+        for i in range(5):
+            article = Article.objects.create(title=f'Indexed {i}', content='<p>Body</p>', status='ready')
+            article.categories.set([category])
+            article.authors.set(authors)
+        Article.objects.create(title='Draft', content='<p>Body</p>', status='draft')
+        self.checkpoint = os.path.join(tempfile.mkdtemp(), 'checkpoint.json')
+
+    def test_records_are_built_from_prefetched_relations(self):
+        articles = list(self.adapter.get_queryset())
+        with self.assertNumQueries(0):
+            records = [self.adapter.get_raw_record(article) for article in articles]
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records[0]['content_excerpt'], 'Body')
+        self.assertEqual({author['name'] for author in records[0]['authors']}, {'Author 0', 'Author 1'})
+        # Records built without prefetching are identical
+        self.assertEqual(self.adapter.get_raw_record(Article.objects.get(pk=articles[0].pk)), records[0])
+
+    def test_batches_and_resumes_from_checkpoint(self):
+        with patch.object(algolia_engine.client, 'batch', side_effect=[None, None, RuntimeError('down')]) as batch:
+            with self.assertRaises(RuntimeError):
+                call_command('reindex_articles', chunk_size=2, checkpoint=self.checkpoint, stdout=StringIO())
+        self.assertEqual(batch.call_count, 3)
+        with open(self.checkpoint) as checkpoint_file:
+            self.assertEqual(json.load(checkpoint_file)['indexed'], 4)
+
+        out = StringIO()
+        with patch.object(algolia_engine.client, 'batch') as batch:
+            call_command('reindex_articles', chunk_size=2, checkpoint=self.checkpoint, stdout=out)
+        requests = batch.call_args.kwargs['batch_write_params']['requests']
+        self.assertEqual(len(requests), 1)
+        self.assertIn('5/5 articles indexed', out.getvalue())
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+@override_settings(ALGOLIA_RECORD_SYNC=True)
+class IndexSyncTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.save_objects = patch.object(algolia_engine.client, 'save_objects').start()
+        self.delete_objects = patch.object(algolia_engine.client, 'delete_objects').start()
+        self.addCleanup(patch.stopall)
+        self.category = Category.objects.create(name='Scaling')
+
+    def pushed_ids(self):
+        return [call.kwargs['objects'][0]['objectID'] for call in self.save_objects.call_args_list]
+
+    def test_changes_in_one_transaction_are_coalesced(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = Article.objects.create(title='Indexed', content='<p>Body</p>', status='ready')
+            article.categories.set([self.category])
+            article.summary = 'Edited'
+            article.save()
+        self.assertEqual(self.pushed_ids(), [str(article.pk)])
+        self.assertEqual(self.save_objects.call_args.kwargs['objects'][0]['summary'], 'Edited')
+        self.assertTrue(IndexedRecord.objects.filter(object_id=str(article.pk)).exists())
+
+    def test_unchanged_records_are_skipped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+        self.assertEqual(self.pushed_ids(), [str(self.category.pk)])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+        self.assertEqual(self.save_objects.call_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Rollups'
+            self.category.save()
+        self.assertEqual(self.save_objects.call_count, 2)
+
+    def test_unpublished_and_deleted_records_are_removed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            draft = Article.objects.create(title='Draft', content='<p>Body</p>', status='draft')
+        self.assertFalse(self.save_objects.called)
+        self.assertFalse(self.delete_objects.called)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.status = 'ready'
+            draft.save()
+        draft_id = str(draft.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.delete()
+        self.delete_objects.assert_called_once_with(index_name=ANY, object_ids=[draft_id])
+        self.assertFalse(IndexedRecord.objects.exists())
+
+    def test_failed_enqueue_does_not_absorb_later_updates(self):
+        with patch('apps.research.tasks.sync_index_record.delay', side_effect=RuntimeError('broker down')):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.category.save()
+        self.assertFalse(self.save_objects.called)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+        self.assertEqual(self.pushed_ids(), [str(self.category.pk)])
+
+    def test_renames_requeue_dependent_articles(self):
+        author = Author.objects.create(
+            user=User.objects.create_user(username='renamed'), full_name='Old Name'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            article = Article.objects.create(title='Indexed', content='<p>Body</p>', status='ready')
+            article.categories.set([self.category])
+            article.authors.set([author])
+        self.save_objects.reset_mock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            author.bio = 'Only the bio'
+            author.save()
+        self.assertNotIn(str(article.pk), self.pushed_ids())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            author.full_name = 'New Name'
+            author.save()
+            self.category.name = 'Rollups'
+            self.category.save()
+        self.assertEqual(self.pushed_ids().count(str(article.pk)), 1)
+        record = next(
+            call.kwargs['objects'][0] for call in self.save_objects.call_args_list
+            if call.kwargs['objects'][0]['objectID'] == str(article.pk)
+        )
+        self.assertEqual(record['authors'][0]['name'], 'New Name')
+        self.assertEqual(record['categories'][0]['name'], 'Rollups')
+
+class PlainTextContentTest(TestCase):
+    def test_text_feeds_reading_time_and_search_records(self):
+        article = Article.objects.create(
+            title='Text', status='ready',
+            content='<p>Fees &amp; <b>blobs</b></p><script>var hidden = 1;</script><p>a &lt; b</p>'
+        )
+        self.assertEqual(article.content_text, 'Fees & blobs a < b')
+        self.assertEqual(article.word_count, 6)
+
+        adapter = algolia_engine.get_adapter(Article)
+        record = adapter.get_raw_record(adapter.get_queryset().get(pk=article.pk))
+        self.assertEqual(record['content_excerpt'], 'Fees & blobs a < b')
+
+    def test_gpt_messages_use_the_same_conversion(self):
+        with patch('apps.research.services.gpt_service.AsyncOpenAI'):
+            service = GPTService()
+        self.assertEqual(service.clear_message('<h2>Intro</h2>\n<p>Fees &amp;   blobs</p>'), 'Intro Fees & blobs')
+
+class TypeaheadTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        typeahead_index.root = None
+        self.popular = Article.objects.create(title='Rollup economics', content='<p>Body</p>', status='ready')
+        self.niche = Article.objects.create(title='Rollups and DA', content='<p>Body</p>', status='ready')
+        Article.objects.filter(pk=self.popular.pk).update(views=50)
+        Article.objects.filter(pk=self.niche.pk).update(views=5)
+        Article.objects.create(title='Rollup draft', content='<p>Body</p>', status='draft')
+        self.category = Category.objects.create(name='Rollups')
+        self.popular.categories.set([self.category])
+        self.author = Author.objects.create(
+            user=User.objects.create_user(username='typeahead'), full_name='Rolf Émile'
+        )
+
+    def labels(self, query):
+        return [result['label'] for result in APIClient().get('/api/typeahead/', {'q': query}).data['results']]
+
+    def test_suggestions_are_ranked_by_views(self):
+        self.assertEqual(self.labels('rol'), ['Rollup economics', 'Rollups', 'Rollups and DA', 'Rolf Émile'])
+        self.assertEqual(self.labels('emi'), ['Rolf Émile'])
+        self.assertEqual(self.labels('rollups d'), ['Rollups and DA'])
+        self.assertEqual(self.labels('zk'), [])
+        with self.assertNumQueries(0):
+            typeahead_index.search('ro')
+
+    def test_saves_update_the_index_incrementally(self):
+        self.labels('rol')
+        self.niche.refresh_from_db()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.niche.title = 'Data availability'
+            self.niche.save()
+            Category.objects.create(name='Data')
+        with self.assertNumQueries(0):
+            # The trie was updated in place rather than rebuilt
+            self.assertEqual(self.labels('data'), ['Data availability', 'Data'])
+        self.assertNotIn('Rollups and DA', self.labels('rol'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.popular.delete()
+        self.assertEqual(self.labels('econ'), [])
+
+    def test_scheduled_publishing_adds_suggestions(self):
+        self.labels('rol')
+        Article.objects.create(
+            title='Rollup roadmap', content='<p>Body</p>', status='draft',
+            scheduled_publish_time=timezone.now() + timedelta(minutes=5)
+        )
+        with patch('apps.research.tasks.timezone.now', return_value=timezone.now() + timedelta(minutes=10)):
+            with self.captureOnCommitCallbacks(execute=True):
+                publish_scheduled_articles()
+        with self.assertNumQueries(0):
+            self.assertIn('Rollup roadmap', self.labels('roadmap'))
+
+    def test_other_workers_replay_changes(self):
+        other_worker = TypeaheadIndex()
+        self.assertEqual(len(other_worker.search('rol')), 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.full_name = 'Ana Lyst'
+            self.author.save()
+        # The shared version is only checked once per sync interval
+        self.assertIn('Rolf Émile', [result['label'] for result in other_worker.search('rol')])
+
+        other_worker.synced_at -= TYPEAHEAD_SYNC_INTERVAL
+        with self.assertNumQueries(0):
+            self.assertFalse(other_worker.is_stale())
+            self.assertEqual([result['label'] for result in other_worker.search('rol')], [
+                'Rollup economics', 'Rollups', 'Rollups and DA'
+            ])
+            self.assertEqual(other_worker.search('ana')[0]['label'], 'Ana Lyst')
+
+    def test_workers_rebuild_when_a_change_is_lost(self):
+        other_worker = TypeaheadIndex()
+        other_worker.search('rol')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Sequencers'
+            self.category.save()
+        cache.delete(TYPEAHEAD_CHANGE_KEY.format(version=other_worker.version + 1))
+        # The change may still be on its way, so the first sync waits for it
+        other_worker.synced_at -= TYPEAHEAD_SYNC_INTERVAL
+        self.assertFalse(other_worker.is_stale())
+        other_worker.synced_at -= TYPEAHEAD_SYNC_INTERVAL
+        self.assertTrue(other_worker.is_stale())
+        self.assertEqual(other_worker.search('seq')[0]['label'], 'Sequencers')
+
+class RssFeedTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Scaling')
+        author = Author.objects.create(user=User.objects.create_user(username='feed-author'), full_name='Feed Author')
+        for i in range(5):
+            article = Article.objects.create(
+                title=f'Feed article {i}', summary='Summary', content='<p>Body</p>', status='ready',
+                scheduled_publish_time=timezone.now() - timedelta(days=i)
+            )
+            article.categories.set([category])
+            article.authors.set([author])
+        self.article = article
+
+    def test_relations_are_loaded_in_batches(self):
+        # Articles, categories and authors with their users
+        with self.assertNumQueries(3):
+            response = self.client.get('/research/rss/')
+        self.assertContains(response, 'Feed Author')
+        self.assertContains(response, '<category>Scaling</category>')
+
+    def test_polls_are_served_from_cache_until_an_edit(self):
+        first = self.client.get('/research/rss/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/research/rss/')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/research/rss/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        # Links are absolute, so other hosts get their own feed
+        self.assertContains(self.client.get('/research/rss/', HTTP_HOST='mirror.example.com'), 'mirror.example.com')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.title = 'Edited feed article'
+            self.article.save()
+        response = self.client.get('/research/rss/')
+        self.assertContains(response, 'Edited feed article')
+        self.assertNotEqual(response['ETag'], first['ETag'])
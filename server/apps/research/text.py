@@ -0,0 +1,47 @@
+import logging
+import re
+import lxml.html
+
+logger = logging.getLogger(__name__)
+
+# Opening tags of the headings listed in the table of contents
+HEADING_TAG_RE = re.compile(r'<(h[1-3])(\s[^>]*)?>', re.IGNORECASE)
+ID_ATTRIBUTE_RE = re.compile(r'''(?<=\s)id\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'>]+)''', re.IGNORECASE)
+
+
+def html_to_text(content):
+    """Return the visible text of an HTML fragment with whitespace collapsed."""
+    if not content or not content.strip():
+        return ''
+    root = lxml.html.fragment_fromstring(content, create_parent='div')
+    for element in list(root.iter('script', 'style')):
+        element.drop_tree()
+    return ' '.join(' '.join(root.itertext()).split())
+
+
+def set_heading_ids(content, ids):
+    """
+    Set the ``id`` of every h1-h3 opening tag of ``content``, in document order,
+    leaving the rest of the markup exactly as written. ``content`` is returned
+    unchanged when its tags cannot be matched up with ``ids``.
+    """
+    tags = list(HEADING_TAG_RE.finditer(content))
+    if len(tags) != len(ids):
+        # e.g. a heading inside a comment, which the parser does not see
+        logger.warning(f"Found {len(tags)} heading tags for {len(ids)} headings, leaving them unanchored")
+        return content
+
+    pieces = []
+    end = 0
+    for match, heading_id in zip(tags, ids):
+        attributes = match.group(2) or ''
+        anchor = f'id="{heading_id}"'
+        if ID_ATTRIBUTE_RE.search(attributes):
+            attributes = ID_ATTRIBUTE_RE.sub(lambda _: anchor, attributes, count=1)
+        else:
+            attributes = f'{attributes} {anchor}'
+        pieces.append(content[end:match.start()])
+        pieces.append(f'<{match.group(1)}{attributes}>')
+        end = match.end()
+    pieces.append(content[end:])
+    return ''.join(pieces)
@@ -0,0 +1,300 @@
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+from .models import Article, Author, Category
+
+logger = logging.getLogger(__name__)
+
+TYPEAHEAD_VERSION_KEY = 'research:typeahead_version'
+TYPEAHEAD_CHANGE_KEY = 'research:typeahead_change:{version}'
+# Rebuild at least this often so rankings pick up views flushed since the last build
+TYPEAHEAD_MAX_AGE = 60 * 15
+# How often a worker looks for changes made by the other workers
+TYPEAHEAD_SYNC_INTERVAL = 5
+# How long changes stay available to replay; tries older than TYPEAHEAD_MAX_AGE are rebuilt anyway
+TYPEAHEAD_CHANGE_TIMEOUT = TYPEAHEAD_MAX_AGE * 2
+# Workers further behind than this rebuild rather than replay
+TYPEAHEAD_MAX_REPLAY = 500
+# Suggestions kept ranked on each trie node
+TYPEAHEAD_TOP = 10
+
+
+def normalize(text):
+    """Lowercase ``text`` and strip its accents so "Ethé" is typed as "ethe"."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(text):
+    return re.findall(r'\w+', normalize(text))
+
+
+class _Node:
+    __slots__ = ('children', 'keys', 'top')
+
+    def __init__(self):
+        self.children = {}
+        # Entries with a word ending at this node
+        self.keys = set()
+        # Best ranked entries of the whole subtree, None until a lookup needs them
+        self.top = None
+
+
+class TypeaheadIndex:
+    """
+    A prefix trie over the words of ready article titles, category names and
+    author names. Each worker process holds one, built on first use and kept
+    current by save signals. Every change is also numbered and stored in the
+    shared cache, so the other workers replay it into their own trie.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.build_lock = threading.Lock()
+        self.root = None
+        self.entries = {}
+        # Number of the last shared change applied to this trie
+        self.version = None
+        self.built_at = 0
+        self.synced_at = 0
+        # A change found missing by the last sync, which may still be in flight
+        self.missing = None
+        self.outdated = False
+
+    # Building
+
+    def build(self):
+        """Load every suggestion from the database, replacing the current trie."""
+        cache.add(TYPEAHEAD_VERSION_KEY, 0, timeout=None)
+        version = cache.get(TYPEAHEAD_VERSION_KEY)
+        articles = Article.objects.filter(status='ready').values_list('id', 'title', 'slug', 'views')
+        category_views = dict(
+            Category.objects.filter(articles__status='ready').annotate(total=Sum('articles__views'))
+            .values_list('id', 'total')
+        )
+        author_views = dict(
+            Author.objects.filter(articles__status='ready').annotate(total=Sum('articles__views'))
+            .values_list('id', 'total')
+        )
+
+        entries = {}
+        for article_id, title, slug, views in articles:
+            entries[('article', article_id)] = self._entry('article', article_id, title, slug, views)
+        for category_id, name, slug in Category.objects.values_list('id', 'name', 'slug'):
+            entries[('category', category_id)] = self._entry(
+                'category', category_id, name, slug, category_views.get(category_id)
+            )
+        for author_id, full_name in Author.objects.exclude(full_name__isnull=True).exclude(full_name='') \
+                .values_list('id', 'full_name'):
+            entries[('author', author_id)] = self._entry(
+                'author', author_id, full_name, None, author_views.get(author_id)
+            )
+
+        root = _Node()
+        for key, entry in entries.items():
+            self._insert(root, key, entry)
+        # Rank the one letter prefixes up front, they have the largest subtrees
+        for node in root.children.values():
+            self._top(node, entries)
+
+        with self.lock:
+            self.root = root
+            self.entries = entries
+            self.version = version
+            self.built_at = self.synced_at = time.monotonic()
+            self.missing = None
+            self.outdated = False
+        logger.info(f"Built typeahead index with {len(entries)} entries")
+
+    def _entry(self, kind, object_id, label, slug, views):
+        return {
+            'type': kind,
+            'id': str(object_id),
+            'label': label,
+            'slug': slug,
+            'views': views or 0,
+            'words': frozenset(tokenize(label)),
+        }
+
+    def _insert(self, root, key, entry):
+        for word in entry['words']:
+            node = root
+            node.top = None
+            for char in word:
+                node = node.children.setdefault(char, _Node())
+                node.top = None
+            node.keys.add(key)
+
+    def _remove(self, root, key, entry):
+        for word in entry['words']:
+            node = root
+            path = [node]
+            for char in word:
+                node = node.children.get(char)
+                if node is None:
+                    break
+                path.append(node)
+            else:
+                node.keys.discard(key)
+            for visited in path:
+                visited.top = None
+
+    # Lookups
+
+    def is_stale(self):
+        """Replay the changes made by other workers and tell whether the trie must be rebuilt."""
+        if self.root is None or time.monotonic() - self.built_at > TYPEAHEAD_MAX_AGE:
+            return True
+        if time.monotonic() - self.synced_at >= TYPEAHEAD_SYNC_INTERVAL:
+            self._sync()
+        return self.outdated
+
+    def _sync(self):
+        with self.lock:
+            self.synced_at = time.monotonic()
+            latest = cache.get(TYPEAHEAD_VERSION_KEY)
+            if latest == self.version:
+                return
+            # A missing or reset counter, or too many changes, means starting over
+            if latest is None or self.version is None or not 0 < latest - self.version <= TYPEAHEAD_MAX_REPLAY:
+                self.outdated = True
+                return
+            keys = [TYPEAHEAD_CHANGE_KEY.format(version=version) for version in range(self.version + 1, latest + 1)]
+            changes = cache.get_many(keys)
+            for version, key in enumerate(keys, self.version + 1):
+                if key not in changes:
+                    # Give a change that was numbered but not stored yet until the next sync
+                    if self.missing == version:
+                        self.outdated = True
+                    self.missing = version
+                    return
+                self._apply(*changes[key])
+                self.version = version
+            self.missing = None
+
+    def search(self, query, limit=TYPEAHEAD_TOP):
+        """Return the best ranked suggestions whose words start with every word of ``query``."""
+        words = tokenize(query)
+        if not words:
+            return []
+        if self.is_stale():
+            with self.build_lock:
+                # Another thread may have rebuilt it while this one waited
+                if self.is_stale():
+                    self.build()
+
+        with self.lock:
+            # Every typed word must start one of the words of a suggestion
+            nodes = [self._find(word) for word in dict.fromkeys(words)]
+            if None in nodes:
+                return []
+            if len(nodes) == 1 and limit <= TYPEAHEAD_TOP:
+                ranked = self._top(nodes[0])
+            else:
+                keys = set.intersection(*sorted((self._collect(node) for node in nodes), key=len))
+                ranked = heapq.nsmallest(limit, (self.entries[key] for key in keys), key=self._rank_key)
+            return [
+                {name: value for name, value in entry.items() if name != 'words'}
+                for entry in ranked[:limit]
+            ]
+
+    def _find(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _collect(self, node):
+        keys = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            keys.update(current.keys)
+            stack.extend(current.children.values())
+        return keys
+
+    def _rank_key(self, entry):
+        return -entry['views'], entry['label']
+
+    def _rank(self, entries):
+        return sorted(entries, key=self._rank_key)
+
+    def _top(self, node, entries=None):
+        if node.top is None:
+            entries = self.entries if entries is None else entries
+            node.top = self._rank(entries[key] for key in self._collect(node))[:TYPEAHEAD_TOP]
+        return node.top
+
+    # Incremental updates
+
+    def update(self, kind, object_id, label=None, slug=None, views=None):
+        """
+        Replace or, without a label, remove one suggestion, and share the
+        change with the other workers.
+        """
+        change = (kind, object_id, label, slug, views)
+        with self.lock:
+            if self.root is not None:
+                self._apply(*change)
+            version = self._share(change)
+            # Changes numbered before this one are replayed by the next sync, this one again with them
+            if self.version is not None and version == self.version + 1:
+                self.version = version
+
+    def _apply(self, kind, object_id, label, slug, views):
+        key = (kind, object_id)
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self._remove(self.root, key, previous)
+        if label:
+            # Views only grow, and the saved instance may predate the last flush
+            views = max(views or 0, previous['views'] if previous else 0)
+            entry = self._entry(kind, object_id, label, slug, views)
+            self.entries[key] = entry
+            self._insert(self.root, key, entry)
+
+    def _share(self, change):
+        try:
+            version = cache.incr(TYPEAHEAD_VERSION_KEY)
+        except ValueError:
+            cache.add(TYPEAHEAD_VERSION_KEY, 0, timeout=None)
+            version = cache.incr(TYPEAHEAD_VERSION_KEY)
+        cache.set(TYPEAHEAD_CHANGE_KEY.format(version=version), change, TYPEAHEAD_CHANGE_TIMEOUT)
+        return version
+
+
+typeahead_index = TypeaheadIndex()
+
+
+def update_typeahead(instance, deleted=False):
+    """
+    Bring the suggestion for a saved or deleted article, category or author up
+    to date once the current transaction commits.
+    """
+    if isinstance(instance, Article):
+        args = ('article', instance.pk, instance.title if instance.status == 'ready' else None, instance.slug,
+                instance.views)
+    elif isinstance(instance, Category):
+        args = ('category', instance.pk, instance.name, instance.slug)
+    elif isinstance(instance, Author):
+        args = ('author', instance.pk, instance.full_name)
+    else:
+        return
+    if deleted:
+        args = args[:2]
+
+    def apply():
+        try:
+            typeahead_index.update(*args)
+        except Exception as e:
+            logger.error(f"Error updating typeahead index: {str(e)}", exc_info=True)
+
+    transaction.on_commit(apply)
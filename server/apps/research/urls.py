@@ -3,7 +3,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic.base import RedirectView
 from rest_framework.routers import DefaultRouter
-from .views import ArticleViewSet, AuthorViewSet, tinymce_upload_image
+from .views import ArticleViewSet, AuthorViewSet, tinymce_upload_image, typeahead
 from .redirects_urls import urlpatterns as redirects_urlpatterns
 from .rss import LatestArticlesFeed
 
@@ -14,8 +14,13 @@ router.register(r'authors', AuthorViewSet, basename='author')
 urlpatterns = [
     path('', RedirectView.as_view(url='/admin/', permanent=False)),
     *redirects_urlpatterns,
+    # Ahead of the router, whose article detail route matches any slug
+    re_path(r'^api/articles/search/$',
+            ArticleViewSet.as_view({'get': 'search'}),
+            name='article-search'),
     path('api/', include(router.urls)),
     path('tinymce/upload/', tinymce_upload_image, name='tinymce_upload'),
+    path('api/typeahead/', typeahead, name='typeahead'),
     re_path(r'^api/articles/category/(?P<category_slug>[-\w]+)/$', 
             ArticleViewSet.as_view({'get': 'retrieve_by_category'}), 
             name='article-list-by-category'),
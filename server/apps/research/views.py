@@ -1,27 +1,45 @@
 import logging
+import re
 from django.views.generic.base import RedirectView
 from rest_framework.decorators import action
-from django.db.models import F, Count, Q, Prefetch
+from django.db.models import BooleanField, Prefetch
+from django.db.models.expressions import RawSQL
 from django.shortcuts import render, get_object_or_404
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 import uuid
-from django.db import transaction
+from django.db import connection, transaction
 from rest_framework import serializers
 from urllib.parse import quote
 from .models import Article, ArticleSlugHistory, Author, Category
+from .models.article import PUBLISHED_ORDERING
 from .permissions import ArticleUserWritePermission
-from .serializers import ArticleSerializer, ArticleCreateUpdateSerializer, ArticleListSerializer, AuthorSerializer, CategorySerializer
+from .serializers import ArticleSerializer, ArticleCreateUpdateSerializer, ArticleListSerializer, AuthorSerializer, CategorySerializer, project_queryset
 import cloudinary.uploader
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.core.exceptions import ValidationError
-from rest_framework.decorators import api_view, permission_classes, throttle_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import api_view, permission_classes, throttle_classes, renderer_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.throttling import UserRateThrottle
-from django.core.cache import cache
-from rest_framework.pagination import PageNumberPagination
+from .cache import (
+    get_cached_article_detail, set_cached_article_detail,
+    resolve_article_identifier, forget_article_identifiers,
+)
+from .services.view_counter import get_view_counter
+from .renderers import ORJSONRenderer
+from rest_framework.renderers import BrowsableAPIRenderer
+from .search import search_articles, search_facets
+from .typeahead import typeahead_index, TYPEAHEAD_TOP
+from .conditional import make_validators, collection_validators, not_modified_response, apply_validators
+from django.utils.dateparse import parse_datetime
+from rest_framework.pagination import PageNumberPagination, BasePagination, _positive_int
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+from base64 import b64decode, b64encode
+from datetime import datetime
+import binascii
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -31,6 +49,91 @@ class CategoryArticlesPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+class ArticleKeysetPagination(BasePagination):
+    """
+    Cursor pagination over (scheduled_publish_time, id), newest first.
+
+    Each page seeks past the last row of the previous one instead of counting
+    and skipping rows, so deep pages cost the same as the first one.
+    """
+    page_size = 55
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*PUBLISHED_ORDERING)
+        limit = self.page_size + 1
+
+        position = self.decode_cursor(request)
+        if position is None:
+            results = list(queryset[:limit])
+        else:
+            published, article_id = position
+            if published is None:
+                results = list(queryset.filter(scheduled_publish_time__isnull=True, id__lt=article_id)[:limit])
+            else:
+                # Seek through the scheduled articles, then start on the unscheduled tail,
+                # so that each query is a single range of article_status_publish_idx
+                results = list(queryset.filter(self.seek_before(published, article_id))[:limit])
+                if len(results) < limit:
+                    results += queryset.filter(scheduled_publish_time__isnull=True)[:limit - len(results)]
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def seek_before(self, published, article_id):
+        """Match the scheduled articles ordered after ``(published, article_id)``."""
+        quote_name = connection.ops.quote_name
+        table = quote_name(Article._meta.db_table)
+        return RawSQL(
+            f'({table}.{quote_name("scheduled_publish_time")}, {table}.{quote_name("id")}) < (%s, %s)',
+            (
+                Article._meta.get_field('scheduled_publish_time').get_db_prep_value(published, connection),
+                Article._meta.pk.get_db_prep_value(article_id, connection),
+            ),
+            output_field=BooleanField(),
+        )
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            published, article_id = b64decode(encoded.encode('ascii')).decode('ascii').split('|')
+            return (datetime.fromisoformat(published) if published else None, uuid.UUID(article_id))
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, article):
+        published = article.scheduled_publish_time.isoformat() if article.scheduled_publish_time else ''
+        return b64encode(f'{published}|{article.id}'.encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
 class LoggingRedirectView(RedirectView):
     def get(self, request, *args, **kwargs):
         logger.info(
@@ -42,10 +145,25 @@ class LoggingRedirectView(RedirectView):
 
 class ArticleViewSet(viewsets.ModelViewSet):
     permission_classes = [ArticleUserWritePermission]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     pagination_class = CategoryArticlesPagination
+
+    @property
+    def paginator(self):
+        """Use keyset pagination when a cursor is requested, page numbers otherwise."""
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params if self.request is not None else {}
+            if 'cursor' in params or params.get('pagination') == 'cursor':
+                self._paginator = ArticleKeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
     
+    # Actions that render many articles and therefore use the lightweight list payload
+    list_actions = ('list', 'retrieve_by_category', 'retrieve_by_category_tree', 'search')
+
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in self.list_actions:
             return ArticleListSerializer
         if self.request.method in ['POST', 'PUT', 'PATCH']:
             return ArticleCreateUpdateSerializer
@@ -55,8 +173,22 @@ class ArticleViewSet(viewsets.ModelViewSet):
         return {'request': self.request}
 
     def get_queryset(self):
-        return Article.objects.filter(status='ready').select_related('primary_category').prefetch_related('categories', 'authors')
+        queryset = Article.objects.filter(status='ready').select_related('primary_category').prefetch_related('categories', 'authors').order_by(*PUBLISHED_ORDERING)
+        if self.action in self.list_actions:
+            queryset = self.project(queryset)
+        return queryset
+
+    def project(self, queryset):
+        """Load only the columns rendered by the serializer of the current action."""
+        return project_queryset(queryset, self.get_serializer_class())
     
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = collection_validators(request)
+        response = not_modified_response(request, etag, last_modified)
+        if response is not None:
+            return response
+        return apply_validators(super().list(request, *args, **kwargs), etag, last_modified)
+
     def retrieve(self, request, *args, **kwargs):
         identifier = kwargs.get('pk')
         logger.info(f"Retrieve called with identifier: {identifier}")
@@ -91,36 +223,55 @@ class ArticleViewSet(viewsets.ModelViewSet):
     def retrieve_by_identifier(self, request, identifier=None):
         try:
             logger.info(f"Retrieve by identifier called with identifier: {identifier}")
-            with transaction.atomic():
-                if self.is_valid_uuid(identifier):
-                    instance = Article.objects.get(pk=identifier)
-                    logger.info(f"Found article by UUID: {instance.title}")
-                else:
-                    try:
-                        instance = Article.objects.get(slug=identifier)
-                        logger.info(f"Found article by slug: {instance.title}")
-                    except Article.DoesNotExist:
-                        logger.info(f"Article with slug '{identifier}' not found. Checking slug history...")
-                        slug_history = get_object_or_404(ArticleSlugHistory, old_slug=identifier)
-                        instance = slug_history.article
-                        logger.info(f"Found article in slug history: {instance.title}")
-                        new_url = request.build_absolute_uri().replace(
-                            f'/api/articles/{quote(identifier)}/',
-                            f'/api/articles/{quote(instance.slug)}/'
-                        )
-                        logger.info(f"Redirecting to new URL: {new_url}")
-                        return Response({
-                            'type': 'redirect',
-                            'new_url': new_url,
-                            'data': self.get_serializer(instance).data
-                        }, status=status.HTTP_301_MOVED_PERMANENTLY)
-    
-                Article.objects.filter(pk=instance.pk).update(views=F('views') + 1)
-                instance.refresh_from_db()
-    
-                serializer = self.get_serializer(instance)
-                return Response(serializer.data)
-    
+            resolved = resolve_article_identifier(identifier)
+            if resolved is None:
+                logger.info(f"No article found for identifier: {identifier}")
+                return Response({'error': 'Article does not exist'},
+                                status=status.HTTP_404_NOT_FOUND)
+
+            data = get_cached_article_detail(resolved['id'])
+            instance = None
+            if data is None:
+                instance = Article.objects.get(pk=resolved['id'])
+                logger.info(f"Loaded article: {instance.title}")
+                updated_at = instance.updated_at
+            else:
+                updated_at = parse_datetime(data['updated_at']) if data['updated_at'] else None
+
+            if not self.is_valid_uuid(identifier) and identifier != resolved['slug']:
+                logger.info(f"Slug '{identifier}' found in slug history for article {resolved['id']}")
+                if data is None:
+                    data = dict(self.get_serializer(instance).data)
+                    set_cached_article_detail(data)
+                new_url = request.build_absolute_uri().replace(
+                    f'/api/articles/{quote(identifier)}/',
+                    f'/api/articles/{quote(resolved["slug"])}/'
+                )
+                logger.info(f"Redirecting to new URL: {new_url}")
+                return Response({
+                    'type': 'redirect',
+                    'new_url': new_url,
+                    'data': data
+                }, status=status.HTTP_301_MOVED_PERMANENTLY)
+
+            etag, last_modified = make_validators(request, resolved['id'], updated_at, last_modified=updated_at)
+            persisted_views = instance.views if data is None else data['views']
+            response = not_modified_response(request, etag, last_modified)
+            if response is not None:
+                self.increment_views(resolved['id'], persisted_views)
+                return response
+
+            if data is None:
+                data = dict(self.get_serializer(instance).data)
+                set_cached_article_detail(data)
+            response = Response({**data, 'views': self.increment_views(data['id'], persisted_views)})
+            return apply_validators(response, etag, last_modified)
+
+        except Article.DoesNotExist:
+            logger.info(f"Dropping stale lookup entry for identifier: {identifier}")
+            forget_article_identifiers(identifier)
+            return Response({'error': 'Article does not exist'},
+                            status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             logger.error(f"Error retrieving article by identifier: {e}")
             return Response({'error': 'Article does not exist'}, 
@@ -129,15 +280,31 @@ class ArticleViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], url_path=r'category/(?P<category_slug>[-\w]+)')
     def retrieve_by_category(self, request, category_slug=None):
         try:
-            instances = Article.objects.filter(categories__slug=category_slug)
+            instances = self.get_queryset().filter(categories__slug=category_slug)
             if not instances.exists():
                 return Response({'error': 'No articles found for this category'}, status=status.HTTP_404_NOT_FOUND)
-            serializer = self.get_serializer(instances, many=True)
-            return Response({'success': True, 'data': serializer.data})
+            etag, last_modified = collection_validators(request)
+            response = not_modified_response(request, etag, last_modified)
+            if response is not None:
+                return response
+
+            page = self.paginate_queryset(instances)
+            serializer = self.get_serializer(page, many=True)
+            return apply_validators(self.get_paginated_response(serializer.data), etag, last_modified)
+        except NotFound:
+            raise
         except Exception as e:
             logger.error(f"Error retrieving articles by category: {e}")
             return Response({'error': 'Category does not exist'}, status=status.HTTP_404_NOT_FOUND)
     
+    def increment_views(self, article_id, persisted_views):
+        """Buffer a read of the article and return its running view total."""
+        try:
+            return get_view_counter().record_view(article_id, persisted_views)
+        except Exception as e:
+            logger.error(f"Error recording article view: {e}")
+            return persisted_views
+
     def is_valid_uuid(self, value):
         try:
             uuid.UUID(value)
@@ -145,20 +312,90 @@ class ArticleViewSet(viewsets.ModelViewSet):
         except ValueError:
             return False
         
+    @action(detail=False, methods=['get'], url_path=r'category-tree/(?P<category_slug>[-\w]+)')
+    def retrieve_by_category_tree(self, request, category_slug=None):
+        """List the ready articles of a category and all of its descendants."""
+        try:
+            category = get_object_or_404(Category, slug=category_slug)
+            in_subtree = Article.categories.through.objects.filter(
+                category__path__startswith=category.path
+            ).values('article_id')
+            instances = self.get_queryset().filter(pk__in=in_subtree)
+            etag, last_modified = collection_validators(request)
+            response = not_modified_response(request, etag, last_modified)
+            if response is not None:
+                return response
+
+            page = self.paginate_queryset(instances)
+            serializer = self.get_serializer(page, many=True)
+            return apply_validators(self.get_paginated_response(serializer.data), etag, last_modified)
+
+        except (Http404, NotFound):
+            raise
+        except Exception as e:
+            logger.error(f"Error retrieving articles by category tree: {e}")
+            return Response(
+                {'error': 'An error occurred while fetching articles'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    # Routed in urls.py ahead of the router, as retrieve_by_identifier would take
+    # "search" for an article slug; Article reserves the slug
+    def search(self, request):
+        """Rank the ready articles matching ``q``, with category and author facets."""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'A search query is required'}, status=status.HTTP_400_BAD_REQUEST)
+        category_slug = request.query_params.get('category')
+        if category_slug and not re.fullmatch(r'[-\w]+', category_slug):
+            return Response({'error': 'Invalid category slug'}, status=status.HTTP_400_BAD_REQUEST)
+        author_id = request.query_params.get('author')
+        if author_id and not self.is_valid_uuid(author_id):
+            return Response({'error': 'Invalid author id'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            instances = search_articles(query, self.get_queryset())
+            facets = search_facets(instances)
+            if category_slug:
+                instances = instances.filter(categories__slug=category_slug)
+            if author_id:
+                instances = instances.filter(authors__id=author_id)
+
+            # Results are ordered by relevance, which keyset cursors cannot seek through
+            self._paginator = self.pagination_class()
+            page = self.paginate_queryset(instances)
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+            response.data['facets'] = facets
+            return response
+        except NotFound:
+            raise
+        except Exception as e:
+            logger.error(f"Error searching articles: {e}")
+            return Response(
+                {'error': 'An error occurred while searching articles'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
     @action(detail=False, methods=['get'], url_path=r'primary-category/(?P<category_slug>[-\w]+)')
     def retrieve_by_primary_category(self, request, category_slug=None):
         try:
             category = get_object_or_404(Category, slug=category_slug, is_primary=True)
-            instances = Article.objects.filter(categories=category, status='ready')
+            instances = self.project(Article.objects.filter(categories=category, status='ready').order_by(*PUBLISHED_ORDERING))
+            etag, last_modified = collection_validators(request)
+            response = not_modified_response(request, etag, last_modified)
+            if response is not None:
+                return response
             
             page = self.paginate_queryset(instances)
             if page is not None:
                 serializer = self.get_serializer(page, many=True)
-                return self.get_paginated_response(serializer.data)
+                return apply_validators(self.get_paginated_response(serializer.data), etag, last_modified)
             
             serializer = self.get_serializer(instances, many=True)
-            return Response({'success': True, 'data': serializer.data})
+            return apply_validators(Response({'success': True, 'data': serializer.data}), etag, last_modified)
         
+        except NotFound:
+            raise
         except Category.DoesNotExist:
             logger.error(f"Primary category with slug '{category_slug}' does not exist")
             return Response(
@@ -194,54 +431,71 @@ class ArticleViewSet(viewsets.ModelViewSet):
                     'error': f"Invalid sort field. Valid options: {', '.join(valid_sort_fields)}"
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            categories = Category.objects.annotate(
-                article_count=Count(
-                    'articles',
-                    filter=Q(articles__status='ready'),
-                    distinct=True
-                )
-            )
+            # article_count is maintained by signals, so sorting by it is an index read
+            categories = Category.objects.all()
 
             if primary_only:
                 categories = categories.filter(is_primary=True)
             
             categories = categories.order_by(sort_by)
 
-            # Prefetch related articles for each category
+            etag, last_modified = collection_validators(request)
+            response = not_modified_response(request, etag, last_modified)
+            if response is not None:
+                return response
+
+            # Prefetch only the latest articles of each category; Django slices
+            # the prefetch per category with a ROW_NUMBER() window in the database
             categories_with_articles = categories.prefetch_related(
                 Prefetch(
                     'articles',
-                    queryset=Article.objects.filter(status='ready').select_related('primary_category').prefetch_related('categories', 'authors').order_by('-created_at'),
+                    queryset=project_queryset(
+                        Article.objects.filter(status='ready').select_related('primary_category').prefetch_related('categories', 'authors').order_by('-created_at', '-id'),
+                        ArticleListSerializer
+                    )[:articles_page_size],
                     to_attr='prefetched_articles'
                 )
             )
 
+            categories_with_articles = list(categories_with_articles)
+            latest_ids = [
+                category.prefetched_articles[0].pk
+                for category in categories_with_articles
+                if category.is_primary and category.prefetched_articles
+            ]
+            # The latest articles render their full content, so load them separately in one query
+            latest_data = {
+                article['id']: article
+                for article in ArticleSerializer(
+                    Article.objects.filter(pk__in=latest_ids),
+                    many=True,
+                    context={'request': request}
+                ).data
+            }
+
             response_data = []
             for category in categories_with_articles:
                 category_data = CategorySerializer(category).data
-                category_articles = category.prefetched_articles[:articles_page_size]
+                category_articles = category.prefetched_articles
                 
                 category_data['articles'] = ArticleListSerializer(
                     category_articles,
                     many=True,
                     context={'request': request}
                 ).data
-                category_data['total_articles'] = len(category.prefetched_articles)
+                category_data['total_articles'] = category.article_count
                 
                 if category.is_primary and category_articles:
-                    category_data['latest_article'] = ArticleSerializer(
-                        category_articles[0],
-                        context={'request': request}
-                    ).data
+                    category_data['latest_article'] = latest_data.get(str(category_articles[0].pk))
                 else:
                     category_data['latest_article'] = None
 
                 response_data.append(category_data)
 
-            return Response({
+            return apply_validators(Response({
                 'success': True,
                 'data': response_data
-            }, status=status.HTTP_200_OK)
+            }, status=status.HTTP_200_OK), etag, last_modified)
 
         except Exception as e:
             logger.error(f"Error retrieving categories: {str(e)}", exc_info=True)
@@ -254,13 +508,40 @@ class AuthorViewSet(viewsets.ModelViewSet):
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
     permission_classes = [ArticleUserWritePermission]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
 
     @action(detail=True, methods=['get'])
     def articles(self, request, pk=None):
         author = self.get_object()
-        articles = Article.objects.filter(authors=author).prefetch_related('categories', 'authors')
-        serializer = ArticleSerializer(articles, many=True)
-        return Response(serializer.data)
+        articles = project_queryset(
+            Article.objects.filter(authors=author, status='ready')
+            .select_related('primary_category')
+            .prefetch_related('categories', 'authors')
+            .order_by(*PUBLISHED_ORDERING),
+            ArticleListSerializer
+        )
+        paginator = CategoryArticlesPagination()
+        page = paginator.paginate_queryset(articles, request, view=self)
+        serializer = ArticleListSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@renderer_classes([ORJSONRenderer])
+def typeahead(request):
+    """Suggest articles, categories and authors whose names start with the typed words."""
+    try:
+        limit = _positive_int(request.query_params.get('limit', TYPEAHEAD_TOP), strict=True, cutoff=TYPEAHEAD_TOP)
+    except ValueError:
+        limit = TYPEAHEAD_TOP
+    try:
+        return Response({'results': typeahead_index.search(request.query_params.get('q', ''), limit)})
+    except Exception as e:
+        logger.error(f"Error serving typeahead suggestions: {e}")
+        return Response(
+            {'error': 'An error occurred while fetching suggestions'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
 
 class ImageUploadRateThrottle(UserRateThrottle):
     rate = '60/hour'
@@ -29,6 +29,11 @@ app.conf.beat_schedule = {
         'task': 'apps.research.tasks.publish_scheduled_articles',
         'schedule': crontab(minute='*/1'),  # Runs every minute
     },
+
+    'flush-article-views-every-minute': {
+        'task': 'apps.research.tasks.flush_article_views',
+        'schedule': crontab(minute='*/1'),  # Runs every minute
+    },
     
     'send-scheduled-newsletter': {
         'task': 'apps.newsletter.tasks.send_newsletter_via_email',
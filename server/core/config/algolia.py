@@ -3,4 +3,9 @@ from decouple import config
 ALGOLIA = {
     'APPLICATION_ID': config('ALGOLIA_APPLICATION_ID'),
     'API_KEY': config('ALGOLIA_API_KEY'),
-}
\ No newline at end of file
+    # Records are synced by apps.research.indexing from Celery instead of on every save
+    'AUTO_INDEXING': False,
+}
+
+# Push changed records to Algolia after saves
+ALGOLIA_RECORD_SYNC = config('ALGOLIA_RECORD_SYNC', default=True, cast=bool)
\ No newline at end of file
@@ -26,7 +26,8 @@ load_dotenv()
 from decouple import config
 from .cloudinary import CLOUDINARY_DOMAIN, CLOUDINARY_STORAGE
 from .beehiiv import BEEHIIV_CONFIG
-from .algolia import ALGOLIA
+from .algolia import ALGOLIA, ALGOLIA_RECORD_SYNC
+from .cache import CACHES
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -215,4 +216,17 @@ OPENAI_API_KEY = config('OPENAI_API_KEY', default=None)
 BEEHIIV_API_KEY = BEEHIIV_CONFIG['API_KEY']
 BEEHIIV_PUBLICATION_ID = BEEHIIV_CONFIG['PUBLICATION_ID']
 
-ALGOLIA = ALGOLIA
\ No newline at end of file
+ALGOLIA = ALGOLIA
+ALGOLIA_RECORD_SYNC = ALGOLIA_RECORD_SYNC
+
+# Research API caching (seconds)
+ARTICLE_DETAIL_CACHE_TIMEOUT = config('ARTICLE_DETAIL_CACHE_TIMEOUT', default=60 * 15, cast=int)
+# How long a lookup of an unknown article slug or UUID is remembered
+ARTICLE_LOOKUP_MISS_TIMEOUT = config('ARTICLE_LOOKUP_MISS_TIMEOUT', default=60 * 10, cast=int)
+# The rendered RSS feed is also dropped whenever the research cache is invalidated
+RSS_FEED_CACHE_TIMEOUT = config('RSS_FEED_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+# Article views are buffered in Redis (the Celery broker by default) and
+# flushed to the database by the flush_article_views task. When set to an
+# empty string every view is written straight to the database instead.
+ARTICLE_VIEW_COUNTER_URL = config('ARTICLE_VIEW_COUNTER_URL', default=CELERY_BROKER_URL)
\ No newline at end of file
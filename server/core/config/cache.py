@@ -0,0 +1,23 @@
+from decouple import config
+from .celery_config import CELERY_BROKER_URL
+
+# Research cache generations, identifier lookups, typeahead changes and index
+# pending keys must be seen by every web and Celery process, so the cache is
+# shared through Redis, the Celery broker by default. 'locmem://' keeps it
+# in-process, which is only safe with a single process, e.g. in tests.
+LOCAL_CACHE_URL = 'locmem://'
+REDIS_CACHE_URL = config('REDIS_CACHE_URL', default=CELERY_BROKER_URL)
+
+if REDIS_CACHE_URL == LOCAL_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
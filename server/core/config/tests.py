@@ -1,2 +1,14 @@
 from .base import *
 
+# Keep test runs from reaching out to Algolia on every save
+ALGOLIA = {**ALGOLIA, 'AUTO_INDEXING': False}
+ALGOLIA_RECORD_SYNC = False
+
+# Buffer article views in-process instead of Redis
+ARTICLE_VIEW_COUNTER_URL = 'locmem://'
+
+# Tests run in a single process, so an in-process cache is shared by everything
+CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# Run Celery tasks inline
+CELERY_TASK_ALWAYS_EAGER = True